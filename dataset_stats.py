@@ -0,0 +1,197 @@
+import os
+import cv2
+import json
+import uuid
+import threading
+import numpy as np
+from typing import Dict, Optional
+
+STATS_FILE = "dataset_stats.json"
+STATS_FOLDER = "dataset_stats"
+
+
+class DatasetStats:
+    """
+    Class to keep running statistics of the saved images.
+
+    Channel means and variances are combined with the parallel form of
+    Welford's algorithm, so statistics of single images, sessions and workers
+    can be merged without keeping the pixels. Updates are thread-safe.
+
+    Attributes:
+        pixels (int): Number of pixels seen.
+        images (int): Number of images seen.
+        mean (np.ndarray): Per-channel mean in the image channel order (BGR for OpenCV images).
+        m2 (np.ndarray): Per-channel sum of squared differences from the mean.
+        histogram (np.ndarray): Histogram of the pixel brightness with 256 bins.
+        sources (Dict[str, int]): Number of images per source video.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty DatasetStats instance.
+        """
+        self.pixels = 0
+        self.images = 0
+        self.mean = np.zeros(0, dtype=np.float64)
+        self.m2 = np.zeros(0, dtype=np.float64)
+        self.histogram = np.zeros(256, dtype=np.int64)
+        self.sources: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def std(self) -> np.ndarray:
+        """Get the per-channel standard deviation."""
+        if self.pixels == 0:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self.m2 / self.pixels)
+
+    def update(self, image: np.ndarray, source: str = "") -> None:
+        """
+        Add an image to the statistics.
+
+        Args:
+            image (np.ndarray): The saved image, grayscale or with channels last.
+            source (str): Name of the video the image comes from (default is empty).
+
+        Raises:
+            ValueError: If the image has a different number of channels than the previous ones.
+        """
+        # OpenCV reads crops in place, a float copy of a 4K crop would take hundreds of megabytes
+        pixels = image.shape[0] * image.shape[1]
+        mean, std = cv2.meanStdDev(image)
+        mean, m2 = mean.ravel(), std.ravel() ** 2 * pixels
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 and image.shape[2] == 3 else image
+        # calcHist counts in float32, which is exact up to 2 ** 24 pixels, so large crops are counted in row bands
+        rows = max(1, (1 << 24) // gray.shape[1])
+        histogram = np.zeros(256, dtype=np.int64)
+        for top in range(0, gray.shape[0], rows):
+            histogram += cv2.calcHist([gray[top:top + rows]], [0], None, [256], [0, 256]).ravel().astype(np.int64)
+
+        with self._lock:
+            self._combine(pixels, mean, m2)
+            self.images += 1
+            self.histogram += histogram
+            self.sources[source] = self.sources.get(source, 0) + 1
+
+    def merge(self, other: "DatasetStats") -> None:
+        """
+        Add the statistics of another instance, e.g. of another session or worker.
+
+        Args:
+            other (DatasetStats): The statistics to add.
+
+        Raises:
+            ValueError: If the statistics have a different number of channels.
+        """
+        with self._lock:
+            if other.pixels:
+                self._combine(other.pixels, other.mean, other.m2)
+            self.images += other.images
+            self.histogram += other.histogram
+            for source, count in other.sources.items():
+                self.sources[source] = self.sources.get(source, 0) + count
+
+    def to_dict(self) -> dict:
+        """
+        Convert the statistics to a JSON-serializable dictionary.
+
+        Returns:
+            dict: The statistics.
+        """
+        return {
+            "pixels": self.pixels,
+            "images": self.images,
+            "mean": self.mean.tolist(),
+            "std": self.std.tolist(),
+            "m2": self.m2.tolist(),
+            "histogram": self.histogram.tolist(),
+            "sources": self.sources,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DatasetStats":
+        """
+        Create statistics from a dictionary made by to_dict.
+
+        Args:
+            data (dict): The statistics.
+
+        Returns:
+            DatasetStats: The restored statistics.
+        """
+        stats = cls()
+        stats.pixels = int(data["pixels"])
+        stats.images = int(data["images"])
+        stats.mean = np.asarray(data["mean"], dtype=np.float64)
+        stats.m2 = np.asarray(data["m2"], dtype=np.float64)
+        stats.histogram = np.asarray(data["histogram"], dtype=np.int64)
+        stats.sources = {str(source): int(count) for source, count in data["sources"].items()}
+        return stats
+
+    def save(self, path: os.PathLike) -> None:
+        """
+        Write the statistics to a JSON file, replacing it atomically.
+
+        Args:
+            path (os.PathLike): Path of the file.
+        """
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: os.PathLike) -> "DatasetStats":
+        """
+        Read statistics from a JSON file made by save.
+
+        Args:
+            path (os.PathLike): Path of the file.
+
+        Returns:
+            DatasetStats: The restored statistics.
+        """
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
+
+    def _combine(self, pixels: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        if self.pixels == 0:
+            self.pixels, self.mean, self.m2 = pixels, mean.copy(), m2.copy()
+            return
+        if mean.shape != self.mean.shape:
+            raise ValueError(f"Expected {self.mean.shape[0]} channels, but got {mean.shape[0]}")
+        total = self.pixels + pixels
+        delta = mean - self.mean
+        self.mean = self.mean + delta * pixels / total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.pixels * pixels / total
+        self.pixels = total
+
+
+def save_session_stats(stats: DatasetStats, folder: os.PathLike, session: Optional[str] = None) -> DatasetStats:
+    """
+    Persist the statistics of a session and refresh the merged statistics of the folder.
+
+    Every session writes its own file into the dataset_stats subfolder, so
+    parallel workers never overwrite each other. The merged result of all
+    session files is written to dataset_stats.json.
+
+    Args:
+        stats (DatasetStats): Statistics of the images saved in this session.
+        folder (os.PathLike): The output folder of the dataset.
+        session (Optional[str]): Name of the session file, a random one is used if None.
+
+    Returns:
+        DatasetStats: The merged statistics of every session.
+    """
+    sessions_folder = os.path.join(folder, STATS_FOLDER)
+    os.makedirs(sessions_folder, exist_ok=True)
+    if stats.images:
+        stats.save(os.path.join(sessions_folder, f"{session or uuid.uuid4().hex}.json"))
+
+    merged = DatasetStats()
+    for file_name in sorted(os.listdir(sessions_folder)):
+        if file_name.endswith(".json"):
+            merged.merge(DatasetStats.load(os.path.join(sessions_folder, file_name)))
+    merged.save(os.path.join(folder, STATS_FILE))
+    return merged
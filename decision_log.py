@@ -0,0 +1,86 @@
+import os
+import csv
+from typing import List, NamedTuple
+
+DECISIONS_FILE = "decisions.csv"
+
+
+class Decision(NamedTuple):
+    """
+    A crop chosen by the annotator.
+
+    Attributes:
+        source (str): Absolute path of the video.
+        frame (int): Index of the frame.
+        filename (str): Name the crop was saved under.
+        x (int): X-coordinate of the top-left corner of the crop.
+        y (int): Y-coordinate of the top-left corner of the crop.
+        width (int): Width of the crop.
+        height (int): Height of the crop.
+    """
+    source: str
+    frame: int
+    filename: str
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class DecisionLog:
+    """
+    Class to append every saved crop to a CSV file, so the crops can be exported again later.
+
+    Attributes:
+        path (os.PathLike): Path of the CSV file.
+    """
+
+    def __init__(self, path: os.PathLike):
+        """
+        Initializes the DecisionLog instance, the header is written if the file is new.
+
+        Args:
+            path (os.PathLike): Path of the CSV file.
+        """
+        self.path = path
+        is_new = not os.path.exists(path)
+        self._file = open(path, "a", newline="")
+        self._writer = csv.writer(self._file)
+        if is_new:
+            self._writer.writerow(Decision._fields)
+
+    def record(self, decision: Decision) -> None:
+        """
+        Append a decision to the log, it is flushed at once so a crash does not lose it.
+
+        Args:
+            decision (Decision): The decision to append.
+        """
+        self._writer.writerow(decision)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+    def __enter__(self) -> "DecisionLog":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def read_decisions(path: os.PathLike) -> List[Decision]:
+    """
+    Read every decision from a log.
+
+    Args:
+        path (os.PathLike): Path of the CSV file.
+
+    Returns:
+        List[Decision]: The decisions in the order they were made.
+    """
+    with open(path, newline="") as file:
+        return [Decision(source=row["source"], frame=int(row["frame"]), filename=row["filename"],
+                         x=int(row["x"]), y=int(row["y"]), width=int(row["width"]), height=int(row["height"]))
+                for row in csv.DictReader(file)]
@@ -1,4 +1,5 @@
-from typing import Tuple
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
 
 
 class FrameArea:
@@ -154,3 +155,136 @@ class FrameArea:
         self.y = y
         self.width = width
         self.height = height
+
+    def move(self, dx: int, dy: int, frame_width: int, frame_height: int) -> None:
+        """
+        Move the area by a number of grid steps, keeping it inside the frame.
+
+        Args:
+            dx (int): Number of steps along the x-axis, negative values move left.
+            dy (int): Number of steps along the y-axis, negative values move up.
+            frame_width (int): Width of the frame the area must stay in.
+            frame_height (int): Height of the frame the area must stay in.
+        """
+        self.x = max(0, min(frame_width - self.width, self.x + dx * self.x_step))
+        self.y = max(0, min(frame_height - self.height, self.y + dy * self.y_step))
+
+    def resize(self, dw: int, dh: int, frame_width: int, frame_height: int, min_size: int = 32) -> None:
+        """
+        Change the size of the rectangle, keeping it inside the frame.
+
+        The top-left corner stays in place unless the rectangle would leave the
+        frame, in which case it is shifted back.
+
+        Args:
+            dw (int): Number of pixels to add to the width, negative values shrink it.
+            dh (int): Number of pixels to add to the height, negative values shrink it.
+            frame_width (int): Width of the frame the area must stay in.
+            frame_height (int): Height of the frame the area must stay in.
+            min_size (int): Minimal width and height of the rectangle (default is 32).
+        """
+        self.width = max(min(min_size, frame_width), min(frame_width, self.width + dw))
+        self.height = max(min(min_size, frame_height), min(frame_height, self.height + dh))
+        self.x = min(self.x, frame_width - self.width)
+        self.y = min(self.y, frame_height - self.height)
+
+    def crop(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Get the part of the frame covered by the rectangle.
+
+        Args:
+            frame (np.ndarray): The frame to crop.
+
+        Returns:
+            np.ndarray: A view into the frame, no pixels are copied.
+        """
+        return frame[self.y: self.y + self.height, self.x: self.x + self.width]
+
+
+class FrameAreaSet:
+    """
+    Class to hold several named areas of a frame, one of which is selected for moving.
+
+    Attributes:
+        areas (Dict[str, FrameArea]): The areas by name, in the order they were added.
+        selected_name (str): Name of the selected area.
+    """
+
+    def __init__(self, area: FrameArea, name: str = "area1"):
+        """
+        Initializes the FrameAreaSet instance with a first area.
+
+        Args:
+            area (FrameArea): The first area, it is selected.
+            name (str): Name of the first area, default is 'area1'.
+        """
+        self.areas: Dict[str, FrameArea] = {name: area}
+        self.selected_name = name
+        self._counter = 1
+
+    @property
+    def selected(self) -> FrameArea:
+        """Get the selected area."""
+        return self.areas[self.selected_name]
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+    def __iter__(self) -> Iterator[Tuple[str, FrameArea]]:
+        return iter(list(self.areas.items()))
+
+    def add(self, area: FrameArea, name: Optional[str] = None) -> str:
+        """
+        Add an area and select it.
+
+        Args:
+            area (FrameArea): The area to add.
+            name (Optional[str]): Name of the area, the next free 'areaN' is used if None.
+
+        Returns:
+            str: Name of the added area.
+
+        Raises:
+            ValueError: If an area with this name already exists.
+        """
+        if name is None:
+            while f"area{self._counter}" in self.areas:
+                self._counter += 1
+            name = f"area{self._counter}"
+        if name in self.areas:
+            raise ValueError(f"Area '{name}' already exists")
+        self.areas[name] = area
+        self.selected_name = name
+        return name
+
+    def remove(self, name: Optional[str] = None) -> None:
+        """
+        Remove an area, the first remaining area is selected if the selected one is removed.
+
+        Args:
+            name (Optional[str]): Name of the area, the selected one is removed if None.
+
+        Raises:
+            KeyError: If there is no area with this name.
+            ValueError: If it is the last area.
+        """
+        name = self.selected_name if name is None else name
+        if name not in self.areas:
+            raise KeyError(f"There is no area '{name}'")
+        if len(self.areas) == 1:
+            raise ValueError("The last area can not be removed")
+        del self.areas[name]
+        if name == self.selected_name:
+            self.selected_name = next(iter(self.areas))
+
+    def select_next(self) -> str:
+        """
+        Select the area added after the selected one, wrapping around to the first.
+
+        Returns:
+            str: Name of the selected area.
+        """
+        names = list(self.areas)
+        self.selected_name = names[(names.index(self.selected_name) + 1) % len(names)]
+        return self.selected_name
+
@@ -0,0 +1,418 @@
+import os
+import re
+import cv2
+import glob
+import queue
+import itertools
+import threading
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+IMAGE_EXTENSIONS = (".bmp", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp")
+
+
+class _Failure:
+    """Wrapper for an exception raised by the producer thread."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+class FramePrefetcher:
+    """
+    Class to consume an iterable in a background thread, keeping a few items ready.
+
+    Decoding, scoring and other work done by the wrapped iterable keeps running
+    while the UI thread waits for the annotator.
+
+    Attributes:
+        size (int): Maximal number of items kept ready.
+    """
+
+    def __init__(self, items: Iterable[Any], size: int = 4):
+        """
+        Initializes the FramePrefetcher instance and starts the producer thread.
+
+        Args:
+            items (Iterable[Any]): The iterable to consume, it is closed from the producer thread when done.
+            size (int): Maximal number of items kept ready, default is 4.
+
+        Raises:
+            ValueError: If size is not positive.
+        """
+        self._queue = queue.Queue()
+        self.size = size
+        self._stop = threading.Event()
+        self._is_done = False
+        self._thread = threading.Thread(target=self._run, args=(iter(items),), name="frame-prefetcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def size(self) -> int:
+        """Get the maximal number of items kept ready."""
+        return self._queue.maxsize
+
+    @size.setter
+    def size(self, size: int) -> None:
+        """
+        Set the maximal number of items kept ready, items already ready above it are kept.
+
+        Args:
+            size (int): The new maximal number of items.
+
+        Raises:
+            ValueError: If size is not positive.
+        """
+        if size <= 0:
+            raise ValueError(f"Field 'size' should be greater than zero, but got {size}")
+        with self._queue.mutex:
+            self._queue.maxsize = size
+
+    @property
+    def ready(self) -> int:
+        """Get the number of items that are ready to be taken."""
+        return self._queue.qsize()
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        return self.get()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Take the next item, waiting at most a given time for it.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, None waits until an item is ready.
+
+        Returns:
+            Any: The next item.
+
+        Raises:
+            StopIteration: If the iterable is exhausted.
+            TimeoutError: If no item became ready in time, the next call can wait again.
+        """
+        if self._is_done:
+            raise StopIteration
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No item was ready within {timeout} seconds") from None
+        if item is _DONE:
+            self._is_done = True
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self._is_done = True
+            raise item.error
+        return item
+
+    def close(self) -> None:
+        """Stop the producer thread and drop the items that are ready."""
+        self._is_done = True
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "FramePrefetcher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _put(self, item: Any) -> bool:
+        # Wake up regularly so that close() is noticed while the queue is full
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, items: Iterator[Any]) -> None:
+        try:
+            for item in items:
+                if not self._put(item):
+                    return
+        except Exception as error:
+            self._put(_Failure(error))
+        finally:
+            if hasattr(items, "close"):
+                items.close()
+            self._put(_DONE)
+
+
+def read_frames(cap: Union[cv2.VideoCapture, "ImageSequence"], indexes: Optional[Iterable[int]] = None,
+                position: int = 0, max_grab: int = 30) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Read frames from the video until it ends.
+
+    Args:
+        cap (Union[cv2.VideoCapture, ImageSequence]): The opened video or image sequence.
+        indexes (Optional[Iterable[int]]): Ascending indexes of the frames to read, every frame
+            from position on is read if None.
+        position (int): Index of the frame the video will return next (default is 0).
+        max_grab (int): Longer gaps between indexes are seeked over instead of grabbed (default is 30).
+
+    Yields:
+        Tuple[int, np.ndarray]: The frame index and the frame.
+    """
+    for index in (itertools.count(position) if indexes is None else indexes):
+        if not cap.isOpened():
+            return
+        if index < position or index - position > max_grab:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            position = index
+        # Frames in short gaps are grabbed without being retrieved
+        while position < index:
+            if not cap.grab():
+                return
+            position += 1
+        ret, frame = cap.read()
+        if not ret:
+            return
+        yield index, frame
+        position += 1
+
+
+def is_pattern(path: str) -> bool:
+    """
+    Check whether a path is a glob pattern.
+
+    Args:
+        path (str): The path to check.
+
+    Returns:
+        bool: True if the path contains glob wildcards.
+    """
+    return re.search(r"[*?[]", path) is not None
+
+
+def is_image_sequence(path: os.PathLike) -> bool:
+    """
+    Check whether a path names a folder or a glob pattern of images rather than a video.
+
+    Existing files are always videos, so names such as 'clip [1080p].mp4' are not taken for patterns.
+
+    Args:
+        path (os.PathLike): Path of the source.
+
+    Returns:
+        bool: True if the path is a folder, or a glob pattern that is not an existing file.
+    """
+    path = str(path)
+    return not os.path.isfile(path) and (os.path.isdir(path) or is_pattern(path))
+
+
+def _natural_key(path: str) -> List[Union[int, str]]:
+    # frame_2.png goes before frame_10.png
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", path)]
+
+
+def list_images(path: str) -> List[str]:
+    """
+    List the images of a folder or of a glob pattern in natural order.
+
+    Args:
+        path (str): Path of a folder or a glob pattern such as 'frames/*.jpg'.
+
+    Returns:
+        List[str]: Paths of the image files, numbers in names are compared by value.
+    """
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in os.listdir(path)]
+    else:
+        paths = glob.glob(path)
+    images = [item for item in paths if os.path.isfile(item) and item.lower().endswith(IMAGE_EXTENSIONS)]
+    return sorted(images, key=_natural_key)
+
+
+class ImageSequence:
+    """
+    Class to read a folder of stills like a video, decoding the upcoming images in a thread pool.
+
+    It implements the part of the cv2.VideoCapture interface the tool uses, so
+    frame indexes, skipping and seeking behave the same as with a video.
+    Images are decoded only when read; grabbing an image just moves past it.
+
+    Attributes:
+        paths (List[str]): Paths of the images in frame order.
+        prefetch (int): Number of upcoming images decoded ahead of sequential reads.
+    """
+
+    def __init__(self, paths: List[str], workers: int = 4, prefetch: int = 8):
+        """
+        Initializes the ImageSequence instance.
+
+        Args:
+            paths (List[str]): Paths of the images in frame order.
+            workers (int): Number of decoding threads, default is 4.
+            prefetch (int): Number of upcoming images decoded ahead, default is 8.
+
+        Raises:
+            ValueError: If workers is not positive or prefetch is negative.
+        """
+        if workers <= 0:
+            raise ValueError(f"Field 'workers' should be greater than zero, but got {workers}")
+        if prefetch < 0:
+            raise ValueError(f"Field 'prefetch' should be greater than or equal to zero, but got {prefetch}")
+        self.paths = paths
+        self.prefetch = prefetch
+        self._position = 0
+        self._is_sequential = True
+        self._pending: Dict[int, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-sequence")
+        self._is_released = False
+
+    def isOpened(self) -> bool:
+        """Check whether there are images and the sequence was not released."""
+        return not self._is_released and len(self.paths) > 0
+
+    def get(self, prop_id: int) -> float:
+        """
+        Get a property like cv2.VideoCapture.get.
+
+        Args:
+            prop_id (int): cv2.CAP_PROP_FRAME_COUNT or cv2.CAP_PROP_POS_FRAMES.
+
+        Returns:
+            float: The property value, 0 for other properties.
+        """
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.paths))
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """
+        Set a property like cv2.VideoCapture.set, only the position can be set.
+
+        Args:
+            prop_id (int): cv2.CAP_PROP_POS_FRAMES.
+            value (float): Index of the image to read next.
+
+        Returns:
+            bool: True if the position was set.
+        """
+        if prop_id != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        self._position = min(len(self.paths), max(0, int(value)))
+        # Random access, as when sampling thumbnails, should not decode images that are never read
+        self._is_sequential = False
+        self._drop_pending()
+        return True
+
+    def grab(self) -> bool:
+        """
+        Move past the next image without decoding it.
+
+        Returns:
+            bool: False if the sequence has ended.
+        """
+        if not self.isOpened() or self._position >= len(self.paths):
+            return False
+        self._position += 1
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode the next image.
+
+        Returns:
+            Tuple[bool, Optional[np.ndarray]]: False and None if the sequence has ended or the image
+                could not be decoded, otherwise True and the BGR image.
+        """
+        if not self.isOpened() or self._position >= len(self.paths):
+            return False, None
+        self._drop_pending()
+        stop = self._position + (1 + self.prefetch if self._is_sequential else 1)
+        for index in range(self._position, min(stop, len(self.paths))):
+            if index not in self._pending:
+                self._pending[index] = self._executor.submit(cv2.imread, self.paths[index])
+        frame = self._pending.pop(self._position).result()
+        self._position += 1
+        self._is_sequential = True
+        return frame is not None, frame
+
+    def release(self) -> None:
+        """Stop decoding and free the threads."""
+        self._is_released = True
+        self._drop_pending(everything=True)
+        self._executor.shutdown(wait=True)
+
+    def _drop_pending(self, everything: bool = False) -> None:
+        # Images behind the position or beyond the read-ahead window are no longer needed
+        stop = self._position + 1 + self.prefetch
+        for index in list(self._pending):
+            if everything or index < self._position or index >= stop:
+                self._pending.pop(index).cancel()
+
+
+def open_source(path: os.PathLike, workers: int = 4, prefetch: int = 8) -> Union[cv2.VideoCapture, ImageSequence]:
+    """
+    Open a video file, a folder of images or a glob pattern of images.
+
+    Args:
+        path (os.PathLike): Path of the source.
+        workers (int): Number of decoding threads for images, default is 4.
+        prefetch (int): Number of images decoded ahead, default is 8.
+
+    Returns:
+        Union[cv2.VideoCapture, ImageSequence]: The opened source.
+    """
+    path = str(path)
+    if is_image_sequence(path):
+        return ImageSequence(list_images(path), workers=workers, prefetch=prefetch)
+    return cv2.VideoCapture(path)
+
+
+def get_source_name(path: os.PathLike) -> str:
+    """
+    Get the name used for the files saved from a source.
+
+    Args:
+        path (os.PathLike): Path of a video, a folder or a glob pattern.
+
+    Returns:
+        str: The file or folder name, the name of the folder holding the images for a glob pattern.
+    """
+    folder, _ = _split_pattern(path)
+    return os.path.basename(folder)
+
+
+def _split_pattern(path: os.PathLike) -> Tuple[str, str]:
+    # The absolute path up to the first part with wildcards, and the rest of the pattern
+    path = os.path.abspath(str(path))
+    if not is_pattern(path) or os.path.exists(path):
+        return path, ""
+    parts = path.split(os.sep)
+    first = next(i for i, part in enumerate(parts) if is_pattern(part))
+    return os.sep.join(parts[:first]) or os.sep, os.sep.join(parts[first:])
+
+
+def get_sidecar_base(path: os.PathLike) -> str:
+    """
+    Get the path the sidecar files of a source are named after.
+
+    Sidecars of a video are kept next to it under its own name. Sidecars of
+    images are kept next to their folder, and the pattern is added to the name
+    with every character that is not allowed in file names replaced.
+
+    Args:
+        path (os.PathLike): Path of a video, a folder or a glob pattern.
+
+    Returns:
+        str: The path without the sidecar extension, e.g. '/data/frames._.jpg' for '/data/frames/*.jpg'.
+    """
+    if not is_image_sequence(path):
+        return str(path)
+    folder, pattern = _split_pattern(path)
+    base = os.path.join(os.path.dirname(folder), get_source_name(path))
+    if not pattern:
+        return base
+    return f"{base}.{re.sub(r'[^0-9A-Za-z_.-]+', '_', pattern)}"
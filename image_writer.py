@@ -0,0 +1,131 @@
+import os
+import cv2
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataset_stats import DatasetStats
+from scaling import build_pyramid, letterbox
+from typing import List, Optional, Sequence
+
+
+class ImageWriter:
+    """
+    Class to save images to a folder in background threads.
+
+    cv2.imwrite releases the GIL while encoding, so a small thread pool keeps
+    PNG compression off the UI loop. With several sizes, every image is scaled
+    to each of them in the writer threads and saved into one subfolder per size.
+    Crops of any shape can be letterboxed to squares there as well, so the UI
+    thread never resizes.
+
+    Attributes:
+        folder (os.PathLike): Folder where images are saved.
+        workers (int): Number of writer threads.
+        stats (Optional[DatasetStats]): Statistics updated with every written image.
+        source (str): Name of the video the images come from.
+        sizes (Optional[Sequence[int]]): Lengths of the longest side to save, images are saved as is if None.
+        letterbox (bool): Whether images are padded to squares before scaling.
+    """
+
+    def __init__(self, folder: os.PathLike, workers: int = 4, stats: Optional[DatasetStats] = None,
+                 source: str = "", sizes: Optional[Sequence[int]] = None, letterbox: bool = False):
+        """
+        Initializes the ImageWriter instance.
+
+        Args:
+            folder (os.PathLike): Folder where images are saved.
+            workers (int): Number of writer threads, default is 4.
+            stats (Optional[DatasetStats]): Statistics updated with every written image, default is None.
+            source (str): Name of the video the images come from, default is empty.
+            sizes (Optional[Sequence[int]]): Lengths of the longest side to save, default is None.
+            letterbox (bool): Whether images are padded to squares before scaling, default is False.
+
+        Raises:
+            ValueError: If the folder does not exist, workers is not positive, a size is not positive
+                or letterbox is requested without sizes.
+        """
+        if not os.path.isdir(folder):
+            raise ValueError(f"Folder '{folder}' does not exist")
+        if workers <= 0:
+            raise ValueError(f"Field 'workers' should be greater than zero, but got {workers}")
+        self.folder = folder
+        self.workers = workers
+        self.stats = stats
+        self.source = source
+        self.sizes = sizes
+        self.letterbox = letterbox
+        if letterbox and sizes is None:
+            raise ValueError("Letterboxing requires the sizes to save")
+        if sizes is not None:
+            if not sizes or any(size <= 0 for size in sizes):
+                raise ValueError(f"Sizes should be greater than zero, but got {list(sizes)}")
+            for size in sizes:
+                os.makedirs(os.path.join(folder, str(size)), exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-writer")
+        self._pending: List[Future] = []
+
+    @property
+    def pending(self) -> int:
+        """Get the number of images that are not written yet."""
+        self._pending = [future for future in self._pending if not future.done()]
+        return len(self._pending)
+
+    def submit(self, filename: str, image: np.ndarray) -> Future:
+        """
+        Queue an image to be written to the folder.
+
+        The image is not copied, so views into a frame can be passed as long as
+        the frame is not modified in place afterwards.
+
+        Args:
+            filename (str): Name of the file inside the folder.
+            image (np.ndarray): The image to save.
+
+        Returns:
+            Future: Future resolving to the path of the written file, or of the largest size if several are saved.
+        """
+        future = self._executor.submit(self._write, filename, image)
+        self._pending.append(future)
+        return future
+
+    def flush(self) -> None:
+        """
+        Block until every queued image is written.
+
+        Raises:
+            IOError: If OpenCV failed to write one of the images.
+        """
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Write all queued images and stop the writer threads."""
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ImageWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _write(self, filename: str, image: np.ndarray) -> str:
+        if self.sizes is None:
+            paths = [self._imwrite(os.path.join(self.folder, filename), image)]
+        else:
+            # The largest square is padded once and the smaller ones are scaled from it
+            source = letterbox(image, max(self.sizes))[0] if self.letterbox else image
+            pyramid = build_pyramid(source, self.sizes)
+            paths = [self._imwrite(os.path.join(self.folder, str(size), filename), pyramid[size])
+                     for size in sorted(pyramid, reverse=True)]
+        if self.stats is not None:
+            self.stats.update(image, source=self.source)
+        return paths[0]
+
+    @staticmethod
+    def _imwrite(path: str, image: np.ndarray) -> str:
+        if not cv2.imwrite(path, image):
+            raise IOError(f"Could not write image to '{path}'")
+        return path
@@ -0,0 +1,91 @@
+import cv2
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+MOVES: Dict[int, Tuple[int, int]] = {
+    ord('a'): (-1, 0),
+    ord('d'): (1, 0),
+    ord('w'): (0, -1),
+    ord('s'): (0, 1),
+}
+RESIZES: Dict[int, Tuple[int, int]] = {
+    ord('A'): (-1, 0),
+    ord('D'): (1, 0),
+    ord('W'): (0, -1),
+    ord('S'): (0, 1),
+}
+
+
+class Move(NamedTuple):
+    """
+    Net displacement of several movement keys, in grid steps.
+
+    Attributes:
+        dx (int): Number of steps along the x-axis.
+        dy (int): Number of steps along the y-axis.
+    """
+    dx: int
+    dy: int
+
+
+class Resize(NamedTuple):
+    """
+    Net size change of several resize keys, in resize steps.
+
+    Attributes:
+        dw (int): Number of steps to add to the width.
+        dh (int): Number of steps to add to the height.
+    """
+    dw: int
+    dh: int
+
+
+def drain_keys(first_key: int, wait: Optional[Callable[[int], int]] = None, limit: int = 256) -> List[int]:
+    """
+    Collect the key events queued behind a movement or resize key.
+
+    Reading stops at the first other key, so that saving or switching
+    frames is never merged with the moves that follow it.
+
+    Args:
+        first_key (int): The key that was just received.
+        wait (Optional[Callable[[int], int]]): Function returning the next key or -1, cv2.waitKey is used if None.
+        limit (int): Maximal number of keys to collect (default is 256).
+
+    Returns:
+        List[int]: The received keys in order, starting with first_key.
+    """
+    if wait is None:
+        wait = cv2.waitKey
+    keys = [first_key]
+    while (keys[-1] in MOVES or keys[-1] in RESIZES) and len(keys) < limit:
+        key = wait(1)
+        if key == -1:
+            break
+        keys.append(key)
+    return keys
+
+
+def coalesce_keys(keys: Iterable[int]) -> List[Union[Move, Resize, int]]:
+    """
+    Merge runs of movement keys into a single net Move and runs of resize keys into a single net Resize.
+
+    Args:
+        keys (Iterable[int]): Key codes in the order they were received.
+
+    Returns:
+        List[Union[Move, Resize, int]]: Moves, resizes and the other key codes, in order.
+    """
+    events = []
+    for key in keys:
+        for steps, event_type in ((MOVES, Move), (RESIZES, Resize)):
+            if key not in steps:
+                continue
+            if events and isinstance(events[-1], event_type):
+                previous = events.pop()
+                events.append(event_type(previous[0] + steps[key][0], previous[1] + steps[key][1]))
+            else:
+                events.append(event_type(*steps[key]))
+            break
+        else:
+            events.append(key)
+    return events
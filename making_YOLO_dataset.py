@@ -1,24 +1,51 @@
 import os
 import cv2
+import argparse
+import contextlib
 import tqdm
 import numpy as np
-from frame_area import FrameArea
-from pathlib import Path
-from typing import Tuple
+from dataset_stats import DatasetStats, save_session_stats
+from decision_log import DECISIONS_FILE, Decision, DecisionLog
+from frame_area import FrameArea, FrameAreaSet
+from image_writer import ImageWriter
+from key_events import Move, Resize, coalesce_keys, drain_keys
+from frame_source import (FramePrefetcher, ImageSequence, get_source_name, is_image_sequence, list_images,
+                          open_source, read_frames)
+from memory_guard import DEGRADE_ACTIONS, MEGABYTE, MemoryGuard
+from pacing import RateLimiter
+from prescan import load_signatures, select_frames
+from quality import QualityGate
+from suggestion import suggest_positions
+from tiling import export_tiles
+from timeline import TimelineBuilder, TimelineStrip
+from typing import Iterable, Optional, Sequence, Tuple
+
+POLL_INTERVAL_MS = 20
+FRAME_WAIT_MS = 100
+TITLE_BAR_HEIGHT = 30
+TAB_KEY = 9
+RESIZE_STEP = 32
+AREA_SIZE = 640
+ZOOM_FACTOR = 3.0
 
 
 def get_video_path() -> os.PathLike:
     """
-    Prompt the user for a video file path until a valid one is provided.
+    Prompt the user for a video file, a folder of images or a glob pattern of images until a valid one is provided.
 
     Returns:
-        os.PathLike: The valid video file path.
+        os.PathLike: The valid video file path, folder path or pattern.
 
     Raises:
-        Exception: If the path is incorrect or not a file.
+        Exception: If the path is incorrect, or the pattern or folder matches no images.
     """
     while True:
-        video_name = input("Please specify the full path to the video you want to annotate: ").strip()
+        video_name = input("Please specify the full path to the video or image folder you want to annotate: ").strip()
+
+        if is_image_sequence(video_name):
+            if not list_images(video_name):
+                raise Exception("No images found!")
+            return video_name
 
         if not os.path.exists(video_name):
             raise Exception("Path is incorrect!")
@@ -173,79 +200,311 @@ def crop_image_to_screen_size(frame: np.ndarray, to_width: int, to_height: int)
     return frame, frame.shape[0], frame.shape[1]
 
 
-area = FrameArea(divider=3)
-area.height = 640
-area.width = 640
-is_zoom = False
-
-video_path = get_video_path()
-folder = get_folder_to_save()
-screen_width, screen_height = get_screen_resolution()
-
-cap = cv2.VideoCapture(video_path)
-name = Path(video_path).name
-frames_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-skip = get_count_to_skip(max_frames=frames_count)
-with tqdm.tqdm(total=frames_count) as pbar:
-    while cap.isOpened():
-        ret, frame = cap.read()
-
-        sub_frame, height, width = crop_image_to_screen_size(frame=frame.copy(),
-                                                             to_width=screen_width,
-                                                             to_height=screen_height)
-
-        if skip > 0:
-            skip -= 1
-            test = f"frame {pbar.n} of {frames_count}: {name}"
-            cv2.putText(sub_frame, test, (0, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            cv2.putText(sub_frame, 'SKIPPING', (int(width / 2) - len('SKIPPING') * 15, int(height / 2)),
-                        cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 2)
-
-            cv2.imshow('frame', sub_frame)
-            if cv2.waitKey(1) == ord('q'):
-                break
-            pbar.update(1)
-            continue
-
-        next_frame_flag = False
-        while not next_frame_flag:
-            new_frame = sub_frame.copy()
-            draw_grid(new_frame, area, thickness=1 + int(max(width, height) / 1000), k=width/frame.shape[1])
-            test = f"frame {pbar.n} of {frames_count}: {name}"
-            cv2.putText(new_frame, test, (0, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-
-            cv2.imshow('frame', new_frame)
-
-            if is_zoom:
-                zoomed = zoom_image(image=frame, x=area.x, y=area.y, width=area.width, height=area.height, factor=3)
-                test = f"frame {pbar.n} of {frames_count}: {name}"
-                cv2.putText(zoomed, test, (0, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                cv2.imshow('zoomed_area', zoomed)
-            else:
-                try:
-                    cv2.destroyWindow('zoomed_area')
-                except:
-                    pass
-
-            key = cv2.waitKey(0)
-            match key:
-                case _ if key == ord('a'):
-                    area.x = max(0, area.x - area.x_step)
-                case _ if key == ord('d'):
-                    area.x = min(frame.shape[1] - area.width, area.x + area.x_step)
-                case _ if key == ord('w'):
-                    area.y = max(0, area.y - area.y_step)
-                case _ if key == ord('s'):
-                    area.y = min(frame.shape[0] - area.height, area.y + area.y_step)
-                case _ if key == ord('k'):
-                    cropped_image = frame[area.y: area.y + area.height, area.x: area.x + area.width]
-                    cv2.imwrite(f"{name.split(' ')[0]}_{pbar.n}.png", cropped_image)
-                case _ if key == ord('z'):
-                    is_zoom = not is_zoom
-                case _ if key == ord(' '):
-                    next_frame_flag = True
-                case _ if key == ord('q'):
-                    exit()
-        pbar.update(1)
-cap.release()
-cv2.destroyAllWindows()
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line options of the annotation session.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments, sys.argv is used if None.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Crop 640x640 images from a video for a YOLO dataset.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None,
+                        help="Save every crop at these sizes, each into its own subfolder (default: crop size only).")
+    parser.add_argument("--letterbox", action="store_true",
+                        help="Pad crops of any shape to squares of the saved sizes, YOLO style (default: off).")
+    parser.add_argument("--min-sharpness", type=float, default=0.0,
+                        help="Hide frames whose Laplacian variance is lower (default: 0, disabled).")
+    parser.add_argument("--max-clipping", type=float, default=1.0,
+                        help="Hide frames with a larger fraction of black or white pixels (default: 1, disabled).")
+    parser.add_argument("--min-change", type=int, default=0,
+                        help="With a prescan.py sidecar, hide frames whose hash differs from the previously "
+                             "shown frame in fewer bits (default: 0, disabled).")
+    parser.add_argument("--quality-workers", type=int, default=2,
+                        help="Number of threads scoring upcoming frames (default: 2).")
+    parser.add_argument("--prefetch", type=int, default=4,
+                        help="Number of frames decoded ahead while waiting for keys (default: 4).")
+    parser.add_argument("--preview-fps", type=float, default=15.0,
+                        help="Number of skipped frames shown per second while skipping (default: 15).")
+    parser.add_argument("--timeline", type=int, default=20,
+                        help="Number of thumbnails on the timeline strip, 0 disables it (default: 20).")
+    parser.add_argument("--refresh-rate", type=float, default=30.0,
+                        help="Maximal number of redraws per second while moving the area (default: 30).")
+    parser.add_argument("--suggestions", type=int, default=5,
+                        help="Number of non-overlapping positions the F key cycles through (default: 5).")
+    parser.add_argument("--memory-budget", type=int, default=0,
+                        help="Memory budget in MB, prefetching, zoom and preview are reduced as it is approached "
+                             "(default: 0, disabled).")
+    parser.add_argument("--memory-report", type=int, default=10,
+                        help="Number of biggest allocators reported with --memory-budget (default: 10).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Run the interactive annotation session.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments, sys.argv is used if None.
+    """
+    args = parse_args(argv)
+    if args.letterbox and args.sizes is None:
+        args.sizes = [640]
+    area = FrameArea(divider=3)
+    area.height = AREA_SIZE
+    area.width = AREA_SIZE
+    areas = FrameAreaSet(area)
+    is_zoom = False
+
+    video_path = get_video_path()
+    folder = get_folder_to_save()
+    screen_width, screen_height = get_screen_resolution()
+
+    cap = open_source(video_path, prefetch=args.prefetch)
+    name = get_source_name(video_path)
+    source = os.path.abspath(video_path)
+    prefix = name.split(' ')[0]
+    frames_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    skip = get_count_to_skip(max_frames=frames_count)
+    gate = QualityGate(min_sharpness=args.min_sharpness,
+                       max_clipping=args.max_clipping,
+                       workers=args.quality_workers,
+                       log_path=os.path.join(folder, "quality_scores.csv"))
+    # With a pre-scan sidecar, frames that can not pass are seeked over without being decoded
+    signatures = load_signatures(video_path)
+
+    def get_indexes(start: int) -> Optional[Iterable[int]]:
+        if signatures is None:
+            return None
+        return select_frames(signatures, start=start, min_sharpness=args.min_sharpness, min_change=args.min_change)
+
+    timeline_clicks = []
+
+    def on_timeline_click(event: int, x: int, y: int, flags: int, param) -> None:
+        if event == cv2.EVENT_LBUTTONDOWN:
+            timeline_clicks.append(x)
+
+    refresh = RateLimiter(args.refresh_rate)
+    preview = RateLimiter(args.preview_fps)
+    stats = DatasetStats()
+    strip = None
+    suggestions = []
+    suggested_for = None
+    prefetch = args.prefetch
+    degraded = 0
+    is_quit = False
+    with contextlib.ExitStack() as stack:
+        # Registered before the writer so that it runs after the writer is flushed, also when the session fails
+        stack.callback(save_session_stats, stats, folder)
+        writer = stack.enter_context(ImageWriter(folder, stats=stats, source=name, sizes=args.sizes,
+                                                   letterbox=args.letterbox))
+        decisions = stack.enter_context(DecisionLog(os.path.join(folder, DECISIONS_FILE)))
+        pbar = stack.enter_context(tqdm.tqdm(total=frames_count))
+        timeline = stack.enter_context(TimelineBuilder(video_path, args.timeline)) if args.timeline else None
+        guard = stack.enter_context(MemoryGuard(args.memory_budget * MEGABYTE, top=args.memory_report)) \
+            if args.memory_budget else None
+
+        def stage(stage_name: str) -> contextlib.AbstractContextManager:
+            return guard.stage(stage_name) if guard is not None else contextlib.nullcontext()
+
+        with FramePrefetcher(read_frames(cap, range(skip)), size=args.prefetch) as skipped_frames:
+            for index, frame in skipped_frames:
+                # Every frame is consumed at decode speed, but only some are drawn. Skipped frames
+                # are not kept, so the preview is drawn over the frame without a copy
+                if preview.ready():
+                    sub_frame, height, width = crop_image_to_screen_size(frame=frame,
+                                                                         to_width=screen_width,
+                                                                         to_height=screen_height)
+                    test = f"frame {index} of {frames_count}: {name}"
+                    cv2.putText(sub_frame, test, (0, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    cv2.putText(sub_frame, 'SKIPPING', (int(width / 2) - len('SKIPPING') * 15, int(height / 2)),
+                                cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 2)
+
+                    cv2.imshow('frame', sub_frame)
+                    if cv2.waitKey(1) == ord('q'):
+                        is_quit = True
+                        break
+                pbar.update(1)
+
+        # The frame pipeline is restarted from another frame when the user seeks on the timeline
+        start = skip
+        while not is_quit and start is not None:
+            position, start = start, None
+            frames = FramePrefetcher(read_frames(cap, get_indexes(position), position=position), size=prefetch)
+            with frames, FramePrefetcher(gate.filter(frames, source=name), size=prefetch) as usable_frames:
+                while True:
+                    try:
+                        index, frame, score = usable_frames.get(timeout=FRAME_WAIT_MS / 1000)
+                    except StopIteration:
+                        break
+                    except TimeoutError:
+                        # The gate can reject a long run of frames, quitting and seeking keep working meanwhile
+                        if cv2.waitKey(POLL_INTERVAL_MS) == ord('q'):
+                            is_quit = True
+                        if timeline_clicks:
+                            start = strip.get_index(timeline_clicks[-1])
+                            timeline_clicks.clear()
+                        if is_quit or start is not None:
+                            break
+                        continue
+                    # Frames rejected by the quality gate are counted as processed
+                    pbar.update(index - pbar.n)
+                    # Stills in a folder can differ in size, so every area is fitted into each new frame
+                    for _, item in areas:
+                        item.resize(0, 0, frame.shape[1], frame.shape[0])
+                    # The preview is resized from the frame, so a full resolution copy is not needed
+                    with stage("preview"):
+                        sub_frame, height, width = crop_image_to_screen_size(frame=frame,
+                                                                             to_width=screen_width,
+                                                                             to_height=screen_height)
+
+                    next_frame_flag = False
+                    is_dirty = True
+                    while not next_frame_flag and not is_quit:
+                        if strip is None and timeline is not None and timeline.result is not None:
+                            strip = TimelineStrip(timeline.result, frames_count, width)
+                            cv2.imshow('timeline', strip.render(index))
+                            # The strip is placed right under the frame window
+                            cv2.moveWindow('frame', 0, 0)
+                            cv2.moveWindow('timeline', 0, height + TITLE_BAR_HEIGHT)
+                            cv2.setMouseCallback('timeline', on_timeline_click)
+                            is_dirty = True
+
+                        if is_dirty and refresh.ready():
+                            if guard is not None and guard.check() > degraded:
+                                # Steps are taken in order, each level keeps the ones before it
+                                for level in range(degraded + 1, guard.level + 1):
+                                    match level:
+                                        case 1:
+                                            prefetch = 1
+                                            frames.size = usable_frames.size = prefetch
+                                            if isinstance(cap, ImageSequence):
+                                                cap.prefetch = 0
+                                        case 2:
+                                            is_zoom = False
+                                        case 3:
+                                            screen_width, screen_height = screen_width // 2, screen_height // 2
+                                            sub_frame, height, width = crop_image_to_screen_size(
+                                                frame=frame, to_width=screen_width, to_height=screen_height)
+                                            if strip is not None:
+                                                cv2.moveWindow('timeline', 0, height + TITLE_BAR_HEIGHT)
+                                degraded = guard.level
+                                pbar.write(f"Memory budget nearly reached, {', '.join(DEGRADE_ACTIONS[:degraded])}")
+                                pbar.write(guard.report())
+                            with stage("draw"):
+                                new_frame = sub_frame.copy()
+                                # Every area is drawn on the same copy, the selected one in green
+                                for area_name, item in areas:
+                                    color = (0, 255, 0) if area_name == areas.selected_name else (0, 255, 255)
+                                    draw_grid(new_frame, item, color=color,
+                                              thickness=1 + int(max(width, height) / 1000), k=width/frame.shape[1])
+                                    if len(areas) > 1:
+                                        cv2.putText(new_frame, area_name,
+                                                    (int(item.x * width / frame.shape[1]) + 5,
+                                                     int(item.y * width / frame.shape[1]) + 20),
+                                                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                                test = f"frame {index} of {frames_count}: {name}"
+                                cv2.putText(new_frame, test, (0, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+                            cv2.imshow('frame', new_frame)
+                            if strip is not None:
+                                cv2.imshow('timeline', strip.render(index))
+
+                            if is_zoom:
+                                selected = areas.selected
+                                factor = ZOOM_FACTOR
+                                if selected.width > AREA_SIZE or selected.height > AREA_SIZE:
+                                    # Areas grown past the default are zoomed less, so that the window fits the screen
+                                    factor = min(factor, screen_width / selected.width,
+                                                 screen_height / selected.height)
+                                with stage("zoom"):
+                                    zoomed = zoom_image(image=frame, x=selected.x, y=selected.y,
+                                                        width=selected.width, height=selected.height, factor=factor)
+                                test = f"frame {index} of {frames_count}: {name}"
+                                cv2.putText(zoomed, test, (0, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                                cv2.imshow('zoomed_area', zoomed)
+                            else:
+                                try:
+                                    cv2.destroyWindow('zoomed_area')
+                                except:
+                                    pass
+                            is_dirty = False
+
+                        # Poll instead of blocking, the prefetch and writer threads keep working meanwhile
+                        key = cv2.waitKey(POLL_INTERVAL_MS)
+                        if timeline_clicks:
+                            start = strip.get_index(timeline_clicks[-1])
+                            timeline_clicks.clear()
+                            break
+                        if key == -1:
+                            continue
+                        is_dirty = True
+                        # Held movement keys are merged into one move, so the frame is redrawn once
+                        for event in coalesce_keys(drain_keys(key)):
+                            match event:
+                                case Move():
+                                    areas.selected.move(event.dx, event.dy, frame.shape[1], frame.shape[0])
+                                case Resize():
+                                    areas.selected.resize(event.dw * RESIZE_STEP, event.dh * RESIZE_STEP,
+                                                          frame.shape[1], frame.shape[0])
+                                case _ if event == ord('k'):
+                                    # All areas are queued at once, the names are only added when there are several
+                                    for area_name, item in areas:
+                                        suffix = f"_{area_name}" if len(areas) > 1 else ""
+                                        filename = f"{prefix}_{index}{suffix}.png"
+                                        writer.submit(filename, item.crop(frame))
+                                        decisions.record(Decision(source, index, filename, item.x, item.y,
+                                                                  item.width, item.height))
+                                case _ if event == ord('t'):
+                                    tiles = export_tiles(frame, areas.selected, writer, prefix=f"{prefix}_{index}")
+                                    for filename, x, y in tiles:
+                                        decisions.record(Decision(source, index, filename, x, y,
+                                                                  areas.selected.width, areas.selected.height))
+                                case _ if event == ord('n'):
+                                    new_area = FrameArea(divider=areas.selected.divider)
+                                    new_area.update_position(areas.selected.x, areas.selected.y,
+                                                             areas.selected.width, areas.selected.height)
+                                    new_area.move(1, 1, frame.shape[1], frame.shape[0])
+                                    areas.add(new_area)
+                                case _ if event == ord('x') and len(areas) > 1:
+                                    areas.remove()
+                                case _ if event == TAB_KEY:
+                                    areas.select_next()
+                                case _ if event == ord('f'):
+                                    # Pressing again on the same frame, area and size cycles through the next best
+                                    target = (index, areas.selected_name, areas.selected.width, areas.selected.height)
+                                    if suggested_for != target:
+                                        suggested_for = target
+                                        with stage("suggest"):
+                                            suggestions = suggest_positions(frame, areas.selected, args.suggestions)
+                                    else:
+                                        suggestions = suggestions[1:] + suggestions[:1]
+                                    areas.selected.x, areas.selected.y = suggestions[0]
+                                case _ if event == ord('z'):
+                                    # Zoom stays off once the memory guard has disabled it
+                                    is_zoom = not is_zoom and degraded < 2
+                                case _ if event == ord('[') and strip is not None:
+                                    start = strip.get_neighbour(index, -1)
+                                case _ if event == ord(']') and strip is not None:
+                                    start = strip.get_neighbour(index, 1)
+                                case _ if event == ord(' '):
+                                    next_frame_flag = True
+                                case _ if event == ord('q'):
+                                    is_quit = True
+                        if start is not None:
+                            break
+                    if is_quit or start is not None:
+                        break
+                    pbar.update(1)
+            if start is not None:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        if guard is not None:
+            pbar.write(guard.report())
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import os
+import sys
+import tracemalloc
+import contextlib
+from typing import Dict, Iterator, Sequence
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+DEGRADE_LEVELS = (0.7, 0.8, 0.9)
+DEGRADE_ACTIONS = ("prefetching less", "zoom disabled", "preview shrunk")
+MEGABYTE = 1024 * 1024
+
+
+def get_peak_rss() -> int:
+    """
+    Get the peak resident set size of the process.
+
+    Returns:
+        int: The peak in bytes, 0 if the platform does not report it.
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_rss() -> int:
+    """
+    Get the current resident set size of the process.
+
+    Returns:
+        int: The size in bytes, the peak is returned where the current size is not available.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return get_peak_rss()
+
+
+class MemoryGuard:
+    """
+    Class to watch the memory of the session against a budget and tell when to degrade.
+
+    Allocations are traced with tracemalloc, which sees numpy and OpenCV
+    images, so the report names the lines holding the most memory. Stage
+    peaks include what other threads allocate meanwhile.
+
+    Attributes:
+        budget (int): The memory budget in bytes.
+        top (int): Number of allocators in the report.
+        level (int): Number of degrade steps reached, it never goes down.
+        peak_rss (int): Highest resident set size seen, in bytes.
+        stage_peaks (Dict[str, int]): Highest memory allocated inside each stage, in bytes.
+    """
+
+    def __init__(self, budget: int, top: int = 10, levels: Sequence[float] = DEGRADE_LEVELS):
+        """
+        Initializes the MemoryGuard instance and starts tracing allocations.
+
+        Args:
+            budget (int): The memory budget in bytes.
+            top (int): Number of allocators in the report, default is 10.
+            levels (Sequence[float]): Ascending fractions of the budget at which each degrade step starts.
+
+        Raises:
+            ValueError: If budget or top is not positive.
+        """
+        if budget <= 0:
+            raise ValueError(f"Field 'budget' should be greater than zero, but got {budget}")
+        if top <= 0:
+            raise ValueError(f"Field 'top' should be greater than zero, but got {top}")
+        self.budget = budget
+        self.top = top
+        self.levels = tuple(levels)
+        self.level = 0
+        self.peak_rss = 0
+        self.stage_peaks: Dict[str, int] = {}
+        self._is_tracing = not tracemalloc.is_tracing()
+        if self._is_tracing:
+            tracemalloc.start()
+
+    def check(self) -> int:
+        """
+        Measure the resident set size and update the degrade level.
+
+        Returns:
+            int: The degrade level, 0 while the usage is below the first step.
+        """
+        rss = get_rss()
+        self.peak_rss = max(self.peak_rss, rss, get_peak_rss())
+        reached = sum(rss >= fraction * self.budget for fraction in self.levels)
+        # Levels only go up, so that the tool does not flip back and forth around a step
+        self.level = max(self.level, reached)
+        return self.level
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Record the memory allocated inside a stage of the loop.
+
+        Args:
+            name (str): Name of the stage.
+        """
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            self.stage_peaks[name] = max(self.stage_peaks.get(name, 0), peak - current)
+
+    def report(self) -> str:
+        """
+        Describe the memory use of the session.
+
+        Returns:
+            str: The peak resident set size, the stage peaks and the biggest allocators.
+        """
+        lines = [f"Peak memory: {self.peak_rss / MEGABYTE:.0f} MB of the {self.budget / MEGABYTE:.0f} MB budget"]
+        for name, peak in sorted(self.stage_peaks.items(), key=lambda item: -item[1]):
+            lines.append(f"  stage {name}: {peak / MEGABYTE:.1f} MB")
+        if tracemalloc.is_tracing():
+            lines.append("Biggest allocators:")
+            for statistic in tracemalloc.take_snapshot().statistics("lineno")[:self.top]:
+                frame = statistic.traceback[0]
+                lines.append(f"  {frame.filename}:{frame.lineno}: {statistic.size / MEGABYTE:.1f} MB "
+                             f"in {statistic.count} blocks")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """Stop tracing allocations if the guard started it."""
+        if self._is_tracing:
+            tracemalloc.stop()
+            self._is_tracing = False
+
+    def __enter__(self) -> "MemoryGuard":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,46 @@
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """
+    Class to let an action run at most a given number of times per second.
+
+    Attributes:
+        rate (float): Maximal number of actions per second.
+    """
+
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes the RateLimiter instance.
+
+        Args:
+            rate (float): Maximal number of actions per second.
+            clock (Callable[[], float]): Source of the current time in seconds, default is time.monotonic.
+
+        Raises:
+            ValueError: If rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError(f"Field 'rate' should be greater than zero, but got {rate}")
+        self.rate = rate
+        self._clock = clock
+        self._last = None
+
+    @property
+    def interval(self) -> float:
+        """Get the minimal time between two actions in seconds."""
+        return 1 / self.rate
+
+    def ready(self) -> bool:
+        """
+        Check whether the action may run now, and if so count it as done.
+
+        Returns:
+            bool: True if at least one interval has passed since the previous action.
+        """
+        now = self._clock()
+        if self._last is not None and now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
@@ -0,0 +1,187 @@
+import os
+import cv2
+import tqdm
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from frame_source import get_sidecar_base, is_image_sequence, open_source
+from quality import score_frame
+from typing import Iterator, Optional, Sequence, Tuple
+
+SIGNATURE_DTYPE = np.dtype([
+    ("hash", np.uint64),  # 64-bit difference hash of a 9x8 thumbnail
+    ("brightness", np.float32),  # Mean gray level
+    ("sharpness", np.float32),  # Laplacian variance, the same measure as the quality gate
+    ("motion", np.float32),  # Mean absolute difference to the previous frame
+])
+MOTION_SIZE = (64, 64)
+
+
+def get_signature_path(video_path: os.PathLike) -> str:
+    """
+    Get the path of the signature sidecar of a video.
+
+    Args:
+        video_path (os.PathLike): Path of the video.
+
+    Returns:
+        str: Path of the .npy sidecar next to the video, or next to the folder of an image sequence.
+    """
+    return f"{get_sidecar_base(video_path)}.signatures.npy"
+
+
+def load_signatures(video_path: os.PathLike) -> Optional[np.ndarray]:
+    """
+    Load the signature sidecar of a video if it was built.
+
+    Args:
+        video_path (os.PathLike): Path of the video.
+
+    Returns:
+        Optional[np.ndarray]: The signatures indexed by frame, or None if there is no sidecar.
+    """
+    path = get_signature_path(video_path)
+    if not os.path.isfile(path):
+        return None
+    return np.load(path)
+
+
+def difference_hash(gray: np.ndarray) -> int:
+    """
+    Calculate the 64-bit difference hash of a grayscale image.
+
+    Args:
+        gray (np.ndarray): The grayscale image.
+
+    Returns:
+        int: The hash, similar images differ in few bits.
+    """
+    thumbnail = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = np.packbits(thumbnail[:, 1:] > thumbnail[:, :-1])
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def scan_range(video_path: os.PathLike, start: int, stop: int) -> Tuple[int, np.ndarray]:
+    """
+    Calculate the signatures of a range of frames.
+
+    Args:
+        video_path (os.PathLike): Path of the video.
+        start (int): Index of the first frame.
+        stop (int): Index after the last frame.
+
+    Returns:
+        Tuple[int, np.ndarray]: The start index and the signatures of the frames that could be read.
+    """
+    cap = open_source(video_path)
+    # The frame before the range is read too, so that the first motion value is correct
+    position = max(0, start - 1)
+    if position:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+
+    signatures = []
+    previous = None
+    while position < stop:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        small = cv2.resize(gray, MOTION_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+        if position >= start:
+            motion = 0.0 if previous is None else float(np.abs(small - previous).mean())
+            signatures.append((difference_hash(gray), gray.mean(), score_frame(gray).sharpness, motion))
+        previous = small
+        position += 1
+    cap.release()
+    return start, np.array(signatures, dtype=SIGNATURE_DTYPE)
+
+
+def prescan_video(video_path: os.PathLike, workers: Optional[int] = None) -> np.ndarray:
+    """
+    Calculate the signatures of every frame of a video, splitting the frames between processes.
+
+    Args:
+        video_path (os.PathLike): Path of the video.
+        workers (Optional[int]): Number of processes, the number of CPUs is used if None.
+
+    Returns:
+        np.ndarray: The signatures indexed by frame. Frames that could not be read have a NaN brightness.
+    """
+    cap = open_source(video_path)
+    frames_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    workers = workers or os.cpu_count() or 1
+    bounds = np.linspace(0, frames_count, workers + 1).astype(int)
+    signatures = np.zeros(frames_count, dtype=SIGNATURE_DTYPE)
+    signatures["brightness"] = np.nan
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(scan_range, video_path, int(start), int(stop))
+                   for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        for future in tqdm.tqdm(as_completed(futures), total=len(futures)):
+            start, part = future.result()
+            signatures[start:start + len(part)] = part
+    return signatures
+
+
+def select_frames(signatures: np.ndarray, start: int = 0, min_sharpness: float = 0.0,
+                  min_change: int = 0) -> Iterator[int]:
+    """
+    Select the frames worth showing with the help of the signatures.
+
+    Args:
+        signatures (np.ndarray): The signatures indexed by frame.
+        start (int): Index of the first frame to consider (default is 0).
+        min_sharpness (float): Frames with a lower sharpness are left out (default is 0).
+        min_change (int): Minimal number of hash bits that differ from the previously
+            selected frame, near-duplicates are left out (default is 0).
+
+    Yields:
+        int: Indexes of the selected frames in ascending order.
+    """
+    last_hash = None
+    for index in range(start, len(signatures)):
+        signature = signatures[index]
+        if np.isnan(signature["brightness"]) or signature["sharpness"] < min_sharpness:
+            continue
+        frame_hash = int(signature["hash"])
+        if last_hash is not None and (frame_hash ^ last_hash).bit_count() < min_change:
+            continue
+        last_hash = frame_hash
+        yield index
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line options of the pre-scan.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments, sys.argv is used if None.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Build the per-frame signature sidecar of a video.")
+    parser.add_argument("video", help="Path of the video, image folder or image glob pattern to scan.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of processes (default: number of CPUs).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Scan a video and save its signatures next to it.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments, sys.argv is used if None.
+    """
+    args = parse_args(argv)
+    if not (os.path.isfile(args.video) or is_image_sequence(args.video)):
+        raise Exception("Path is incorrect!")
+    signatures = prescan_video(args.video, workers=args.workers)
+    np.save(get_signature_path(args.video), signatures)
+    print(f"Saved signatures of {len(signatures)} frames to {get_signature_path(args.video)}")
+
+
+if __name__ == '__main__':
+    main()
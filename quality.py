@@ -0,0 +1,151 @@
+import os
+import csv
+import cv2
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+
+class QualityScore(NamedTuple):
+    """
+    Quality metrics of a single frame.
+
+    Attributes:
+        sharpness (float): Variance of the Laplacian, low values mean a blurry frame.
+        dark_clipping (float): Fraction of pixels clipped to black.
+        bright_clipping (float): Fraction of pixels clipped to white.
+    """
+    sharpness: float
+    dark_clipping: float
+    bright_clipping: float
+
+
+def score_frame(frame: np.ndarray, size: int = 320, low: int = 5, high: int = 250) -> QualityScore:
+    """
+    Score the blur and exposure of a frame on a downsampled grayscale copy.
+
+    Args:
+        frame (np.ndarray): The original image frame.
+        size (int): Length of the longest side of the downsampled image (default is 320).
+        low (int): Gray level at or below which a pixel counts as clipped to black (default is 5).
+        high (int): Gray level at or above which a pixel counts as clipped to white (default is 250).
+
+    Returns:
+        QualityScore: The quality metrics of the frame.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    k = size / max(gray.shape[:2])
+    if k < 1:
+        gray = cv2.resize(gray, None, fx=k, fy=k, interpolation=cv2.INTER_AREA)
+
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel() / gray.size
+    return QualityScore(sharpness=sharpness,
+                        dark_clipping=float(hist[:low + 1].sum()),
+                        bright_clipping=float(hist[high:].sum()))
+
+
+class QualityGate:
+    """
+    Class to drop blurry or badly exposed frames before they are displayed.
+
+    Frames are scored in a thread pool that runs ahead of the consumer, so the
+    scores of upcoming frames are ready by the time the annotator gets to them.
+
+    Attributes:
+        min_sharpness (float): Frames with a lower sharpness are dropped, 0 disables the check.
+        max_clipping (float): Frames with a larger clipped fraction on either end are dropped,
+            1 disables the check.
+        workers (int): Number of scoring threads.
+        log_path (Optional[os.PathLike]): CSV file every score is appended to.
+    """
+
+    LOG_HEADER = ("source", "frame", "sharpness", "dark_clipping", "bright_clipping", "passed")
+
+    def __init__(self, min_sharpness: float = 0.0, max_clipping: float = 1.0, workers: int = 2,
+                 log_path: Optional[os.PathLike] = None):
+        """
+        Initializes the QualityGate instance.
+
+        Args:
+            min_sharpness (float): Minimal sharpness of a frame, default is 0 (disabled).
+            max_clipping (float): Maximal clipped fraction of a frame, default is 1 (disabled).
+            workers (int): Number of scoring threads, default is 2.
+            log_path (Optional[os.PathLike]): CSV file every score is appended to, default is None.
+
+        Raises:
+            ValueError: If a threshold or the number of workers is out of range.
+        """
+        if min_sharpness < 0:
+            raise ValueError(f"Field 'min_sharpness' should be greater than or equal to zero, but got {min_sharpness}")
+        if not (0 <= max_clipping <= 1):
+            raise ValueError(f"Field 'max_clipping' should be in the range from 0 to 1, but got {max_clipping}")
+        if workers <= 0:
+            raise ValueError(f"Field 'workers' should be greater than zero, but got {workers}")
+        self.min_sharpness = min_sharpness
+        self.max_clipping = max_clipping
+        self.workers = workers
+        self.log_path = log_path
+
+    def is_usable(self, score: QualityScore) -> bool:
+        """
+        Check whether a frame with the given score passes the thresholds.
+
+        Args:
+            score (QualityScore): The quality metrics of the frame.
+
+        Returns:
+            bool: True if the frame should be shown.
+        """
+        return (score.sharpness >= self.min_sharpness and
+                score.dark_clipping <= self.max_clipping and
+                score.bright_clipping <= self.max_clipping)
+
+    def filter(self, frames: Iterable[Tuple[int, np.ndarray]],
+               source: str = "") -> Iterator[Tuple[int, np.ndarray, QualityScore]]:
+        """
+        Score frames in the background and yield only the usable ones, in order.
+
+        Args:
+            frames (Iterable[Tuple[int, np.ndarray]]): Frame indexes and frames.
+            source (str): Name of the source written to the log (default is empty).
+
+        Yields:
+            Tuple[int, np.ndarray, QualityScore]: Index, frame and score of every usable frame.
+        """
+        log_file = None
+        if self.log_path is not None:
+            is_new = not os.path.exists(self.log_path)
+            log_file = open(self.log_path, "a", newline="")
+            log = csv.writer(log_file)
+            if is_new:
+                log.writerow(self.LOG_HEADER)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="quality-gate")
+        ahead = deque()
+        frames = iter(frames)
+        try:
+            while True:
+                # Keep a couple of frames per worker in flight
+                while len(ahead) < self.workers * 2:
+                    item = next(frames, None)
+                    if item is None:
+                        break
+                    index, frame = item
+                    ahead.append((index, frame, executor.submit(score_frame, frame)))
+                if not ahead:
+                    return
+
+                index, frame, future = ahead.popleft()
+                score = future.result()
+                is_usable = self.is_usable(score)
+                if log_file is not None:
+                    log.writerow((source, index, f"{score.sharpness:.2f}", f"{score.dark_clipping:.4f}",
+                                  f"{score.bright_clipping:.4f}", int(is_usable)))
+                if is_usable:
+                    yield index, frame, score
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if log_file is not None:
+                log_file.close()
@@ -0,0 +1,156 @@
+import os
+import tqdm
+import argparse
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataset_stats import DatasetStats, save_session_stats
+from decision_log import Decision, read_decisions
+from frame_area import FrameArea
+from frame_source import open_source, read_frames
+from image_writer import ImageWriter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def split_decisions(decisions: Sequence[Decision], chunks: int) -> List[List[Decision]]:
+    """
+    Split the decisions into chunks of contiguous frames of a single video.
+
+    Every chunk is read by one process with a single forward pass, so the
+    frames of a video are divided into ranges rather than dealt out.
+
+    Args:
+        decisions (Sequence[Decision]): The logged decisions.
+        chunks (int): Number of chunks per video.
+
+    Returns:
+        List[List[Decision]]: Non-empty chunks sorted by frame.
+    """
+    by_source: Dict[str, List[Decision]] = defaultdict(list)
+    for decision in decisions:
+        by_source[decision.source].append(decision)
+
+    result = []
+    for source_decisions in by_source.values():
+        frames = sorted({decision.frame for decision in source_decisions})
+        ordered = sorted(source_decisions, key=lambda decision: decision.frame)
+        for part in np.array_split(np.array(frames), min(chunks, len(frames))):
+            first, last = int(part[0]), int(part[-1])
+            result.append([decision for decision in ordered if first <= decision.frame <= last])
+    return result
+
+
+def replay_chunk(decisions: List[Decision], folder: os.PathLike, sizes: Optional[Sequence[int]] = None,
+                 letterbox: bool = False, extension: Optional[str] = None) -> Tuple[int, dict]:
+    """
+    Export again the crops of a chunk of decisions of one video.
+
+    Args:
+        decisions (List[Decision]): Decisions of one video sorted by frame.
+        folder (os.PathLike): The output folder.
+        sizes (Optional[Sequence[int]]): Lengths of the longest side to save, crops are saved as is if None.
+        letterbox (bool): Whether crops are padded to squares before scaling.
+        extension (Optional[str]): Image format of the saved crops, e.g. 'jpg', the logged one is kept if None.
+
+    Returns:
+        Tuple[int, dict]: Number of saved crops and the statistics of the saved crops as a dictionary.
+    """
+    by_frame: Dict[int, List[Decision]] = defaultdict(list)
+    for decision in decisions:
+        by_frame[decision.frame].append(decision)
+
+    cap = open_source(decisions[0].source)
+    stats = DatasetStats()
+    count = 0
+    area = FrameArea()
+    with ImageWriter(folder, workers=2, stats=stats, source=os.path.basename(decisions[0].source),
+                     sizes=sizes, letterbox=letterbox) as writer:
+        for index, frame in read_frames(cap, sorted(by_frame)):
+            for decision in by_frame[index]:
+                filename = decision.filename
+                if extension is not None:
+                    filename = f"{os.path.splitext(filename)[0]}.{extension}"
+                area.update_position(decision.x, decision.y, decision.width, decision.height)
+                writer.submit(filename, area.crop(frame))
+                count += 1
+    cap.release()
+    return count, stats.to_dict()
+
+
+def replay(decisions: Sequence[Decision], folder: os.PathLike, workers: Optional[int] = None,
+           sizes: Optional[Sequence[int]] = None, letterbox: bool = False,
+           extension: Optional[str] = None) -> int:
+    """
+    Export again the crops of logged decisions, splitting the frames between processes.
+
+    Args:
+        decisions (Sequence[Decision]): The logged decisions.
+        folder (os.PathLike): The output folder.
+        workers (Optional[int]): Number of processes, the number of CPUs is used if None.
+        sizes (Optional[Sequence[int]]): Lengths of the longest side to save, crops are saved as is if None.
+        letterbox (bool): Whether crops are padded to squares before scaling.
+        extension (Optional[str]): Image format of the saved crops, the logged one is kept if None.
+
+    Returns:
+        int: Number of saved crops, crops of frames that could not be read are missing.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = DatasetStats()
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(replay_chunk, chunk, folder, sizes, letterbox, extension)
+                   for chunk in split_decisions(decisions, workers)]
+        for future in tqdm.tqdm(as_completed(futures), total=len(futures)):
+            chunk_count, chunk_stats = future.result()
+            count += chunk_count
+            stats.merge(DatasetStats.from_dict(chunk_stats))
+    save_session_stats(stats, folder)
+    return count
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line options of the replay.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments, sys.argv is used if None.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Export again the crops of an annotation decision log.")
+    parser.add_argument("log", help="Path of the decisions.csv written by the annotation tool.")
+    parser.add_argument("folder", help="Folder where the crops are saved.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None,
+                        help="Save every crop at these sizes, each into its own subfolder (default: crop size only).")
+    parser.add_argument("--letterbox", action="store_true",
+                        help="Pad crops to squares of the saved sizes, YOLO style (default: off).")
+    parser.add_argument("--format", default=None,
+                        help="Image format of the saved crops, e.g. jpg (default: the logged one).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of processes (default: number of CPUs).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Export again the crops of a decision log without any user interaction.
+
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments, sys.argv is used if None.
+    """
+    args = parse_args(argv)
+    if not os.path.isfile(args.log):
+        raise Exception("Path is not a file!")
+    if not os.path.isdir(args.folder):
+        raise Exception("Path is not a directory!")
+    if args.letterbox and args.sizes is None:
+        args.sizes = [640]
+    decisions = read_decisions(args.log)
+    count = replay(decisions, args.folder, workers=args.workers, sizes=args.sizes, letterbox=args.letterbox,
+                   extension=args.format)
+    print(f"Saved {count} of {len(decisions)} crops to {args.folder}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+from typing import Dict, Sequence, Tuple
+
+
+def get_scaled_size(image: np.ndarray, size: int) -> Tuple[int, int]:
+    """
+    Get the width and height of an image scaled so that its longest side equals size.
+
+    Args:
+        image (np.ndarray): The image.
+        size (int): Target length of the longest side.
+
+    Returns:
+        Tuple[int, int]: The scaled width and height.
+    """
+    height, width = image.shape[:2]
+    k = size / max(height, width)
+    return max(1, round(width * k)), max(1, round(height * k))
+
+
+def build_pyramid(image: np.ndarray, sizes: Sequence[int]) -> Dict[int, np.ndarray]:
+    """
+    Scale an image to several sizes in one cascade.
+
+    Every size is made from the smallest image already built that is not
+    smaller than it. Halvings are done with cv2.pyrDown and the rest with
+    INTER_AREA, and the results are reused as sources for the smaller sizes.
+
+    Args:
+        image (np.ndarray): The image, e.g. a crop of the frame.
+        sizes (Sequence[int]): Target lengths of the longest side.
+
+    Returns:
+        Dict[int, np.ndarray]: The scaled images by size. A size equal to the image size returns the image itself.
+
+    Raises:
+        ValueError: If a size is not positive.
+    """
+    if any(size <= 0 for size in sizes):
+        raise ValueError(f"Sizes should be greater than zero, but got {list(sizes)}")
+
+    levels = [image]  # Built images, largest first
+    results = {}
+    for size in sorted(set(sizes), reverse=True):
+        width, height = get_scaled_size(image, size)
+        sources = [level for level in levels if level.shape[1] >= width and level.shape[0] >= height]
+        if not sources:
+            results[size] = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+            continue
+
+        source = sources[-1]
+        while source.shape[1] >= 2 * width and source.shape[0] >= 2 * height:
+            source = cv2.pyrDown(source)
+            levels.append(source)
+        if source.shape[:2] != (height, width):
+            source = cv2.resize(source, (width, height), interpolation=cv2.INTER_AREA)
+            levels.append(source)
+        results[size] = source
+    return results
+
+
+def letterbox(image: np.ndarray, size: int, color=(114, 114, 114)) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Scale an image to fit a square and pad the rest, following the YOLO letterbox convention.
+
+    The image is centered, the padding is gray (114) and an odd padding puts
+    the extra pixel on the right and bottom.
+
+    Args:
+        image (np.ndarray): The image.
+        size (int): Side of the square.
+        color (tuple): Color of the padding in BGR format (default is YOLO gray).
+
+    Returns:
+        Tuple[np.ndarray, float, Tuple[int, int]]: The square image, the scale ratio and the left and top padding.
+
+    Raises:
+        ValueError: If size is not positive.
+    """
+    if size <= 0:
+        raise ValueError(f"Field 'size' should be greater than zero, but got {size}")
+    height, width = image.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = min(size, round(width * ratio)), min(size, round(height * ratio))
+    if (new_width, new_height) != (width, height):
+        interpolation = cv2.INTER_AREA if ratio < 1 else cv2.INTER_LINEAR
+        image = cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+
+    dw, dh = (size - new_width) / 2, (size - new_height) / 2
+    left, right = round(dw - 0.1), round(dw + 0.1)
+    top, bottom = round(dh - 0.1), round(dh + 0.1)
+    if image.ndim == 2:
+        color = color[0]
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return image, ratio, (left, top)
+
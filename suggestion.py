@@ -0,0 +1,98 @@
+import cv2
+import numpy as np
+from frame_area import FrameArea
+from typing import List, Tuple
+
+
+def get_edge_map(frame: np.ndarray, low: int = 50, high: int = 150) -> np.ndarray:
+    """
+    Find the edges of a frame.
+
+    Args:
+        frame (np.ndarray): The frame, grayscale or BGR.
+        low (int): Lower Canny hysteresis threshold (default is 50).
+        high (int): Upper Canny hysteresis threshold (default is 150).
+
+    Returns:
+        np.ndarray: A uint8 map of the frame size, 1 on edges and 0 elsewhere.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    # Ones instead of 255 keep the integral image within int32 even for 8K frames
+    return (cv2.Canny(gray, low, high) > 0).view(np.uint8)
+
+
+def score_positions(frame: np.ndarray, area: FrameArea,
+                    size: int = 1920) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count the edge pixels under the area at every position of its grid.
+
+    The integral image of the edge map is built once, after which the sum of
+    every window is four lookups, whatever the area size. Larger frames are
+    scored at a reduced size, the positions stay in frame coordinates.
+
+    Args:
+        frame (np.ndarray): The original image frame.
+        area (FrameArea): The FrameArea object whose width, height and steps define the positions.
+        size (int): Frames with a longer side are reduced to it before finding edges (default is 1920).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The x-coordinates of the columns, the
+            y-coordinates of the rows and the scores of shape (rows, columns).
+
+    Raises:
+        ValueError: If the area is empty, has no grid step or does not fit into the frame.
+    """
+    if area.width == 0 or area.height == 0:
+        raise ValueError("The area must have a non-zero width and height.")
+    if area.divider == 0 or area.x_step == 0 or area.y_step == 0:
+        raise ValueError("The area grid step must be greater than zero.")
+    if area.height > frame.shape[0] or area.width > frame.shape[1]:
+        raise ValueError("The area exceeds the image boundaries.")
+
+    frame_height, frame_width = frame.shape[:2]
+    scale = min(1.0, size / max(frame_height, frame_width))
+    if scale < 1.0:
+        frame = cv2.resize(frame, (round(frame.shape[1] * scale), round(frame.shape[0] * scale)),
+                           interpolation=cv2.INTER_AREA)
+    integral = cv2.integral(get_edge_map(frame), sdepth=cv2.CV_32S)
+
+    xs = np.arange(0, frame_width - area.width + 1, area.x_step)
+    ys = np.arange(0, frame_height - area.height + 1, area.y_step)
+    # Window borders in the coordinates of the scored frame
+    top = np.rint(ys * scale).astype(int)[:, None]
+    bottom = np.rint((ys + area.height) * scale).astype(int).clip(max=frame.shape[0])[:, None]
+    left = np.rint(xs * scale).astype(int)[None, :]
+    right = np.rint((xs + area.width) * scale).astype(int).clip(max=frame.shape[1])[None, :]
+    scores = integral[bottom, right] - integral[top, right] - integral[bottom, left] + integral[top, left]
+    return xs, ys, scores
+
+
+def suggest_positions(frame: np.ndarray, area: FrameArea, count: int = 1) -> List[Tuple[int, int]]:
+    """
+    Find the grid positions of the area that cover the most edges.
+
+    Args:
+        frame (np.ndarray): The original image frame.
+        area (FrameArea): The FrameArea object whose width, height and steps define the positions.
+        count (int): Maximal number of positions to return (default is 1).
+
+    Returns:
+        List[Tuple[int, int]]: Top-left corners, best first. Each position does not
+            overlap any position before it.
+
+    Raises:
+        ValueError: If count is not positive or the area does not fit into the frame.
+    """
+    if count <= 0:
+        raise ValueError(f"Field 'count' should be greater than zero, but got {count}")
+    xs, ys, scores = score_positions(frame, area)
+    positions = []
+    # Stable sort, so ties go to the top-left position
+    for flat in np.argsort(-scores, axis=None, kind="stable"):
+        row, col = divmod(int(flat), len(xs))
+        x, y = int(xs[col]), int(ys[row])
+        if all(abs(x - other_x) >= area.width or abs(y - other_y) >= area.height for other_x, other_y in positions):
+            positions.append((x, y))
+            if len(positions) == count:
+                break
+    return positions
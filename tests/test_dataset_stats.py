@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import unittest
+import tracemalloc
+import numpy as np
+from dataset_stats import DatasetStats, STATS_FILE, save_session_stats
+from image_writer import ImageWriter
+
+
+def make_images(count: int, seed: int) -> list:
+    random = np.random.default_rng(seed)
+    return [random.integers(0, 256, (32, 48, 3), dtype=np.uint8) for _ in range(count)]
+
+
+class TestDatasetStats(unittest.TestCase):
+    """
+    Unit tests for the DatasetStats class.
+    """
+
+    def assert_matches(self, stats: DatasetStats, images: list):
+        pixels = np.concatenate([image.reshape(-1, 3) for image in images]).astype(np.float64)
+        self.assertEqual(stats.pixels, pixels.shape[0])
+        self.assertEqual(stats.images, len(images))
+        np.testing.assert_allclose(stats.mean, pixels.mean(axis=0))
+        np.testing.assert_allclose(stats.std, pixels.std(axis=0))
+        self.assertEqual(stats.histogram.sum(), pixels.shape[0])
+
+    def test_update(self):
+        """
+        Test that running updates match a full scan of the images.
+        """
+        images = make_images(5, seed=1)
+        stats = DatasetStats()
+        for image in images:
+            stats.update(image, source="a.mp4")
+        self.assert_matches(stats, images)
+        self.assertEqual(stats.sources, {"a.mp4": 5})
+
+    def test_update_large_crop(self):
+        """
+        Test that a large crop view is measured in place and counted exactly.
+        """
+        frame = np.zeros((4400, 4200, 3), dtype=np.uint8)
+        frame[:, :120] = (10, 20, 30)
+        crop = frame[10:4391, 20:4181]
+        stats = DatasetStats()
+        tracemalloc.start()
+        try:
+            stats.update(crop)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Far less than a float64 copy of the crop, which alone would take 8 bytes per value
+        self.assertLess(peak, crop.nbytes)
+        # More black pixels than float32 can count one by one
+        self.assertEqual(stats.histogram[0], 4061 * 4381)
+        self.assertEqual(stats.histogram.sum(), 4161 * 4381)
+        share = 100 / 4161
+        np.testing.assert_allclose(stats.mean, np.array([10, 20, 30]) * share)
+        np.testing.assert_allclose(stats.std, np.array([10, 20, 30]) * np.sqrt(share * (1 - share)), rtol=1e-6)
+
+    def test_update_gray(self):
+        """
+        Test that grayscale images give a single channel.
+        """
+        image = np.random.default_rng(3).integers(0, 256, (30, 40), dtype=np.uint8)
+        stats = DatasetStats()
+        stats.update(image[5:25, 5:35])
+        np.testing.assert_allclose(stats.mean, [image[5:25, 5:35].mean()])
+        np.testing.assert_allclose(stats.std, [image[5:25, 5:35].std()])
+        np.testing.assert_array_equal(stats.histogram, np.bincount(image[5:25, 5:35].ravel(), minlength=256))
+
+    def test_merge(self):
+        """
+        Test that merging partial statistics matches a full scan of all images.
+        """
+        first, second = make_images(3, seed=2), make_images(4, seed=3)
+        stats, other = DatasetStats(), DatasetStats()
+        for image in first:
+            stats.update(image, source="a.mp4")
+        for image in second:
+            other.update(image, source="b.mp4")
+        stats.merge(other)
+        stats.merge(DatasetStats())
+        self.assert_matches(stats, first + second)
+        self.assertEqual(stats.sources, {"a.mp4": 3, "b.mp4": 4})
+
+    def test_wrong_channels(self):
+        """
+        Test that images with a different number of channels are rejected.
+
+        Raises:
+            ValueError: If the number of channels changes.
+        """
+        stats = DatasetStats()
+        stats.update(np.zeros((4, 4, 3), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            stats.update(np.zeros((4, 4), dtype=np.uint8))
+
+    def test_save_session_stats(self):
+        """
+        Test that statistics of several sessions are persisted and merged.
+        """
+        folder = tempfile.mkdtemp()
+        try:
+            first, second = make_images(2, seed=4), make_images(3, seed=5)
+            for images in (first, second):
+                stats = DatasetStats()
+                with ImageWriter(folder, stats=stats, source="video.mp4") as writer:
+                    for i, image in enumerate(images):
+                        writer.submit(f"{len(images)}_{i}.png", image)
+                merged = save_session_stats(stats, folder)
+
+            self.assert_matches(merged, first + second)
+            self.assert_matches(DatasetStats.load(os.path.join(folder, STATS_FILE)), first + second)
+            self.assertEqual(merged.sources, {"video.mp4": 5})
+        finally:
+            shutil.rmtree(folder)
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from decision_log import DECISIONS_FILE, Decision, DecisionLog, read_decisions
+
+
+class TestDecisionLog(unittest.TestCase):
+    """
+    Unit tests for the crop decision log.
+
+    Attributes:
+        test_dir (str): Path to temporary directory for test artifacts
+        path (str): Path of the log inside the test directory
+    """
+
+    def setUp(self):
+        """Create a temporary directory for the log."""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, DECISIONS_FILE)
+
+    def tearDown(self):
+        """Clean up temporary test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        """
+        Test that recorded decisions are read back in order with their types.
+        """
+        decisions = [Decision("/videos/a.mp4", 7, "a_7.png", 0, 60, 640, 640),
+                     Decision("/videos/a.mp4", 3, "a_3_x80_y0.png", 80, 0, 320, 240)]
+        with DecisionLog(self.path) as log:
+            for decision in decisions:
+                log.record(decision)
+        self.assertEqual(read_decisions(self.path), decisions)
+
+    def test_append_keeps_single_header(self):
+        """
+        Test that a second session appends to the log without repeating the header.
+        """
+        first = Decision("/videos/a.mp4", 1, "a_1.png", 0, 0, 64, 64)
+        second = Decision("/videos/b.mp4", 2, "b_2.png", 32, 32, 64, 64)
+        with DecisionLog(self.path) as log:
+            log.record(first)
+        with DecisionLog(self.path) as log:
+            log.record(second)
+        self.assertEqual(read_decisions(self.path), [first, second])
+        with open(self.path) as file:
+            self.assertEqual(sum(line.startswith("source,") for line in file), 1)
+
+    def test_record_is_flushed(self):
+        """
+        Test that a decision is on disk before the log is closed.
+        """
+        decision = Decision("/videos/a.mp4", 1, "a_1.png", 0, 0, 64, 64)
+        log = DecisionLog(self.path)
+        try:
+            log.record(decision)
+            self.assertEqual(read_decisions(self.path), [decision])
+        finally:
+            log.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
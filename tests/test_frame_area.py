@@ -1,6 +1,7 @@
 import unittest
+import numpy as np
 from ddt import ddt, data, unpack
-from frame_area import FrameArea
+from frame_area import FrameArea, FrameAreaSet
 from typing import Any, List, Dict
 
 @ddt
@@ -381,3 +382,131 @@ class TestPosition(unittest.TestCase):
         self.assertEqual(area.height, height)
 
 
+
+    # Tests for moving by grid steps
+    @data(
+        (0, 0, 1, 0, 213, 0),  # One step right
+        (0, 0, 3, 2, 639, 426),  # Several steps at once
+        (0, 0, -1, -1, 0, 0),  # Clamped at the top-left corner
+        (1000, 400, 5, 5, 1280, 440),  # Clamped at the bottom-right corner
+        (639, 426, -3, -2, 0, 0))  # Back to the origin
+    @unpack
+    def test_frame_area_move_success(self, x: int, y: int, dx: int, dy: int, expected_x: int, expected_y: int):
+        """
+        Test moving the area by grid steps inside a 1920x1080 frame.
+
+        Args:
+            x (int): The initial x-coordinate.
+            y (int): The initial y-coordinate.
+            dx (int): Number of steps along the x-axis.
+            dy (int): Number of steps along the y-axis.
+            expected_x (int): The expected x-coordinate.
+            expected_y (int): The expected y-coordinate.
+
+        Ensures that the area moves by whole steps and stays inside the frame.
+        """
+        area = FrameArea(divider=3)
+        area.update_position(x, y, 640, 640)
+        area.move(dx, dy, 1920, 1080)
+        self.assertEqual((area.x, area.y), (expected_x, expected_y))
+
+    # Tests for resizing
+    @data(
+        (0, 0, 640, 640, 320, 0, 0, 0, 960, 640),  # Wider
+        (0, 0, 640, 640, -320, -600, 0, 0, 320, 40),  # Smaller
+        (0, 0, 640, 640, -1000, 0, 0, 0, 32, 640),  # Not below the minimal size
+        (1280, 440, 640, 640, 320, 0, 960, 440, 960, 640),  # Shifted back into the frame
+        (0, 0, 640, 640, 5000, 5000, 0, 0, 1920, 1080))  # Not larger than the frame
+    @unpack
+    def test_frame_area_resize_success(self, x: int, y: int, width: int, height: int, dw: int, dh: int,
+                                       expected_x: int, expected_y: int, expected_width: int, expected_height: int):
+        """
+        Test resizing the area inside a 1920x1080 frame.
+
+        Args:
+            x (int): The initial x-coordinate.
+            y (int): The initial y-coordinate.
+            width (int): The initial width.
+            height (int): The initial height.
+            dw (int): Pixels added to the width.
+            dh (int): Pixels added to the height.
+            expected_x (int): The expected x-coordinate.
+            expected_y (int): The expected y-coordinate.
+            expected_width (int): The expected width.
+            expected_height (int): The expected height.
+
+        Ensures that the area keeps a valid size and stays inside the frame.
+        """
+        area = FrameArea(divider=3)
+        area.update_position(x, y, width, height)
+        area.resize(dw, dh, 1920, 1080)
+        self.assertEqual((area.x, area.y, area.width, area.height),
+                         (expected_x, expected_y, expected_width, expected_height))
+
+    def test_frame_area_crop_success(self):
+        """
+        Test that the crop is a view of the covered part of the frame.
+        """
+        frame = np.arange(100 * 120 * 3, dtype=np.uint32).reshape(100, 120, 3)
+        area = FrameArea()
+        area.update_position(10, 20, 30, 40)
+        cropped = area.crop(frame)
+        self.assertEqual(cropped.shape, (40, 30, 3))
+        self.assertTrue(np.shares_memory(cropped, frame))
+        np.testing.assert_array_equal(cropped, frame[20:60, 10:40])
+
+
+class TestFrameAreaSet(unittest.TestCase):
+    """
+    Unit tests for the FrameAreaSet class, covering adding, removing and selecting areas.
+    """
+
+    def test_add_and_select(self):
+        """
+        Test that added areas get free names, are selected and are cycled in order.
+        """
+        areas = FrameAreaSet(FrameArea())
+        self.assertEqual(areas.add(FrameArea()), "area2")
+        self.assertEqual(areas.add(FrameArea(), name="car"), "car")
+        self.assertEqual(areas.add(FrameArea()), "area3")
+        self.assertEqual(areas.selected_name, "area3")
+        self.assertEqual([name for name, area in areas], ["area1", "area2", "car", "area3"])
+        self.assertEqual(areas.select_next(), "area1")
+        self.assertEqual(areas.select_next(), "area2")
+
+    def test_add_duplicate(self):
+        """
+        Test that names must be unique.
+
+        Raises:
+            ValueError: If the name is taken.
+        """
+        areas = FrameAreaSet(FrameArea())
+        with self.assertRaises(ValueError):
+            areas.add(FrameArea(), name="area1")
+
+    def test_remove(self):
+        """
+        Test that removing the selected area selects the first remaining one.
+        """
+        first = FrameArea()
+        areas = FrameAreaSet(first)
+        areas.add(FrameArea())
+        areas.remove()
+        self.assertEqual(len(areas), 1)
+        self.assertIs(areas.selected, first)
+        self.assertEqual(areas.add(FrameArea()), "area2")
+
+    def test_remove_wrong(self):
+        """
+        Test that the last area and unknown names can not be removed.
+
+        Raises:
+            ValueError: If it is the last area.
+            KeyError: If the name is unknown.
+        """
+        areas = FrameAreaSet(FrameArea())
+        with self.assertRaises(ValueError):
+            areas.remove()
+        with self.assertRaises(KeyError):
+            areas.remove("missing")
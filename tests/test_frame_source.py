@@ -0,0 +1,252 @@
+import os
+import cv2
+import time
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from frame_source import (FramePrefetcher, ImageSequence, get_sidecar_base, get_source_name,
+                          is_image_sequence, list_images, open_source, read_frames)
+
+
+class TestFramePrefetcher(unittest.TestCase):
+    """
+    Unit tests for the FramePrefetcher class.
+    """
+
+    def test_keeps_order(self):
+        """
+        Test that every item is returned once and in order.
+        """
+        with FramePrefetcher(range(100), size=3) as prefetcher:
+            self.assertEqual(list(prefetcher), list(range(100)))
+
+    def test_runs_ahead(self):
+        """
+        Test that the producer fills the queue while the consumer is idle.
+        """
+        with FramePrefetcher(range(100), size=5) as prefetcher:
+            deadline = time.monotonic() + 2
+            while prefetcher.ready < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(prefetcher.ready, 5)
+
+    def test_close_stops_producer(self):
+        """
+        Test that closing stops an endless producer and closes its generator.
+        """
+        state = {"closed": False}
+
+        def endless():
+            try:
+                while True:
+                    yield 1
+            finally:
+                state["closed"] = True
+
+        prefetcher = FramePrefetcher(endless(), size=2)
+        next(prefetcher)
+        prefetcher.close()
+        self.assertTrue(state["closed"])
+        self.assertEqual(list(prefetcher), [])
+
+    def test_propagates_errors(self):
+        """
+        Test that an exception of the producer is raised in the consumer.
+
+        Raises:
+            RuntimeError: Raised by the wrapped generator.
+        """
+        def failing():
+            yield 1
+            raise RuntimeError("decoder failed")
+
+        with FramePrefetcher(failing()) as prefetcher:
+            self.assertEqual(next(prefetcher), 1)
+            with self.assertRaises(RuntimeError):
+                next(prefetcher)
+
+    def test_get_timeout(self):
+        """
+        Test that waiting for a slow producer times out and can be retried.
+        """
+        def slow():
+            yield 1
+            time.sleep(0.3)
+            yield 2
+
+        with FramePrefetcher(slow(), size=2) as prefetcher:
+            self.assertEqual(prefetcher.get(timeout=1), 1)
+            with self.assertRaises(TimeoutError):
+                prefetcher.get(timeout=0.01)
+            self.assertEqual(prefetcher.get(timeout=1), 2)
+            with self.assertRaises(StopIteration):
+                prefetcher.get(timeout=1)
+
+    def test_shrink_size(self):
+        """
+        Test that a smaller size makes the producer keep fewer items ready.
+        """
+        with FramePrefetcher(range(100), size=5) as prefetcher:
+            prefetcher.size = 2
+            self.assertEqual(prefetcher.size, 2)
+            for _ in range(5):
+                next(prefetcher)
+            time.sleep(0.2)
+            self.assertEqual(prefetcher.ready, 2)
+            self.assertEqual(list(prefetcher), list(range(5, 100)))
+            with self.assertRaises(ValueError):
+                prefetcher.size = 0
+
+    def test_wrong_size(self):
+        """
+        Test that a non-positive size is rejected.
+
+        Raises:
+            ValueError: If size is not positive.
+        """
+        with self.assertRaises(ValueError):
+            FramePrefetcher([], size=0)
+
+
+class TestImageSequence(unittest.TestCase):
+    """
+    Unit tests for reading a folder of stills like a video.
+
+    Attributes:
+        test_dir (str): Path to a folder of 12 images filled with 10 times their index
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Write numbered images and a file that is not an image."""
+        cls.test_dir = tempfile.mkdtemp()
+        for i in range(12):
+            cv2.imwrite(os.path.join(cls.test_dir, f"frame_{i}.png"), np.full((24, 32, 3), i * 10, dtype=np.uint8))
+        with open(os.path.join(cls.test_dir, "notes.txt"), "w") as file:
+            file.write("not an image")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up temporary test environment."""
+        shutil.rmtree(cls.test_dir)
+
+    def test_list_images_natural_order(self):
+        """
+        Test that folders and patterns list only images, with numbers compared by value.
+        """
+        names = [os.path.basename(path) for path in list_images(self.test_dir)]
+        self.assertEqual(names, [f"frame_{i}.png" for i in range(12)])
+        pattern = os.path.join(self.test_dir, "frame_1*.png")
+        self.assertEqual([os.path.basename(path) for path in list_images(pattern)],
+                         ["frame_1.png", "frame_10.png", "frame_11.png"])
+
+    def test_read_frames(self):
+        """
+        Test that frame indexes, grabbing over gaps and seeking match the video semantics.
+        """
+        cap = open_source(self.test_dir, workers=2, prefetch=3)
+        try:
+            self.assertIsInstance(cap, ImageSequence)
+            self.assertEqual(cap.get(cv2.CAP_PROP_FRAME_COUNT), 12)
+            frames = list(read_frames(cap, [0, 1, 4, 2, 11], max_grab=1))
+            self.assertEqual([index for index, _ in frames], [0, 1, 4, 2, 11])
+            for index, frame in frames:
+                self.assertEqual(frame.shape, (24, 32, 3))
+                self.assertEqual(int(frame[0, 0, 0]), index * 10)
+
+            # Reading past the end stops like a video
+            self.assertEqual(cap.get(cv2.CAP_PROP_POS_FRAMES), 12)
+            self.assertEqual(cap.read(), (False, None))
+            self.assertFalse(cap.grab())
+
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 9)
+            self.assertEqual([index for index, _ in read_frames(cap, position=9)], [9, 10, 11])
+        finally:
+            cap.release()
+        self.assertFalse(cap.isOpened())
+
+    def test_grab_does_not_decode(self):
+        """
+        Test that grabbed images are skipped without being decoded.
+        """
+        cap = ImageSequence(list_images(self.test_dir), workers=1, prefetch=0)
+        decoded = []
+        imread = cv2.imread
+
+        def counting_imread(path):
+            decoded.append(os.path.basename(path))
+            return imread(path)
+
+        try:
+            cv2.imread = counting_imread
+            for _ in range(5):
+                self.assertTrue(cap.grab())
+            ret, frame = cap.read()
+        finally:
+            cv2.imread = imread
+            cap.release()
+        self.assertTrue(ret)
+        self.assertEqual(int(frame[0, 0, 0]), 50)
+        self.assertEqual(decoded, ["frame_5.png"])
+
+    def test_bracketed_names(self):
+        """
+        Test that existing files and folders with glob characters in their names are not taken for patterns.
+        """
+        video_path = os.path.join(self.test_dir, "clip [1080p].avi")
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+        for i in range(5):
+            writer.write(np.full((24, 32, 3), i * 10, dtype=np.uint8))
+        writer.release()
+        folder = os.path.join(self.test_dir, "run [2]")
+        os.mkdir(folder)
+        try:
+            self.assertFalse(is_image_sequence(video_path))
+            cap = open_source(video_path)
+            try:
+                self.assertNotIsInstance(cap, ImageSequence)
+                self.assertEqual(len(list(read_frames(cap))), 5)
+            finally:
+                cap.release()
+            self.assertEqual(get_source_name(video_path), "clip [1080p].avi")
+
+            shutil.copy(os.path.join(self.test_dir, "frame_3.png"), folder)
+            self.assertTrue(is_image_sequence(folder))
+            self.assertEqual([os.path.basename(path) for path in list_images(folder)], ["frame_3.png"])
+            self.assertEqual(get_source_name(folder), "run [2]")
+        finally:
+            os.remove(video_path)
+            shutil.rmtree(folder)
+
+    def test_get_sidecar_base(self):
+        """
+        Test that sidecar names of image sources depend on the folder, not on how the path was typed.
+        """
+        parent = os.path.dirname(self.test_dir)
+        name = os.path.basename(self.test_dir)
+        self.assertEqual(get_sidecar_base(self.test_dir), os.path.join(parent, name))
+        self.assertEqual(get_sidecar_base(self.test_dir + os.sep), os.path.join(parent, name))
+        pattern = os.path.join(self.test_dir, "frame_1*.png")
+        self.assertEqual(get_sidecar_base(pattern), os.path.join(parent, f"{name}.frame_1_.png"))
+        self.assertEqual(get_sidecar_base(os.path.relpath(pattern)), get_sidecar_base(pattern))
+        self.assertEqual(get_source_name(os.path.join(self.test_dir, "*", "*.png")), name)
+        self.assertEqual(get_sidecar_base("/videos/clip.mp4"), "/videos/clip.mp4")
+
+    def test_get_source_name(self):
+        """
+        Test the names used for saved files of videos, folders and patterns.
+        """
+        self.assertEqual(get_source_name("/videos/clip 1.mp4"), "clip 1.mp4")
+        self.assertEqual(get_source_name("/stills/run_3/"), "run_3")
+        self.assertEqual(get_source_name("/stills/run_3/*.jpg"), "run_3")
+
+    def test_wrong_workers(self):
+        """
+        Test that the number of decoding threads must be positive.
+
+        Raises:
+            ValueError: If workers is not positive.
+        """
+        with self.assertRaises(ValueError):
+            ImageSequence([], workers=0)
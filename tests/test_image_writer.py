@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from image_writer import ImageWriter
+
+
+class TestImageWriter(unittest.TestCase):
+    """
+    Unit tests for the ImageWriter class.
+    """
+
+    def setUp(self):
+        """Create a temporary output folder."""
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary output folder."""
+        shutil.rmtree(self.folder)
+
+    def test_submit_and_flush(self):
+        """
+        Test that queued images are written once the writer is flushed.
+        """
+        image = np.random.randint(0, 255, (64, 48, 3), dtype=np.uint8)
+        writer = ImageWriter(self.folder, workers=2)
+        try:
+            future = writer.submit("image.png", image)
+            writer.flush()
+            self.assertEqual(writer.pending, 0)
+            self.assertEqual(future.result(), os.path.join(self.folder, "image.png"))
+            np.testing.assert_array_equal(cv2.imread(future.result()), image)
+        finally:
+            writer.close()
+
+    def test_close_on_exit(self):
+        """
+        Test that leaving the context writes every queued image.
+        """
+        image = np.zeros((16, 16, 3), dtype=np.uint8)
+        with ImageWriter(self.folder) as writer:
+            for i in range(10):
+                writer.submit(f"{i}.png", image)
+        self.assertEqual(len(os.listdir(self.folder)), 10)
+
+    def test_sizes(self):
+        """
+        Test that every size is saved into its own subfolder.
+        """
+        image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
+        with ImageWriter(self.folder, sizes=[640, 416, 320]) as writer:
+            future = writer.submit("image.png", image)
+        self.assertEqual(future.result(), os.path.join(self.folder, "640", "image.png"))
+        for size in (640, 416, 320):
+            self.assertEqual(cv2.imread(os.path.join(self.folder, str(size), "image.png")).shape, (size, size, 3))
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "image.png")))
+
+    def test_letterbox(self):
+        """
+        Test that crops of any shape are saved as padded squares of every size.
+        """
+        image = np.random.randint(0, 255, (900, 1500, 3), dtype=np.uint8)
+        with ImageWriter(self.folder, sizes=[640, 320], letterbox=True) as writer:
+            writer.submit("image.png", image)
+        for size in (640, 320):
+            saved = cv2.imread(os.path.join(self.folder, str(size), "image.png"))
+            self.assertEqual(saved.shape, (size, size, 3))
+            self.assertEqual(int(saved[0, 0].min()), 114)
+
+    def test_letterbox_without_sizes(self):
+        """
+        Test that letterboxing needs the target sizes.
+
+        Raises:
+            ValueError: If no sizes are given.
+        """
+        with self.assertRaises(ValueError):
+            ImageWriter(self.folder, letterbox=True)
+
+    def test_wrong_folder(self):
+        """
+        Test that a missing folder is rejected.
+
+        Raises:
+            ValueError: If the folder does not exist.
+        """
+        with self.assertRaises(ValueError):
+            ImageWriter(os.path.join(self.folder, "missing"))
+
+    def test_wrong_workers(self):
+        """
+        Test that a non-positive number of workers is rejected.
+
+        Raises:
+            ValueError: If workers is not positive.
+        """
+        with self.assertRaises(ValueError):
+            ImageWriter(self.folder, workers=0)
+
+    def test_wrong_sizes(self):
+        """
+        Test that empty or non-positive sizes are rejected.
+
+        Raises:
+            ValueError: If a size is not positive.
+        """
+        for sizes in ([], [640, -1]):
+            with self.assertRaises(ValueError):
+                ImageWriter(self.folder, sizes=sizes)
+
+    def test_write_error(self):
+        """
+        Test that failed writes are reported on flush.
+
+        Raises:
+            IOError: If OpenCV can not write the image.
+        """
+        writer = ImageWriter(self.folder)
+        writer.submit("image.unknown_extension", np.zeros((4, 4, 3), dtype=np.uint8))
+        with self.assertRaises(Exception):
+            writer.close()
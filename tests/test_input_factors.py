@@ -8,11 +8,16 @@ processing, and core business logic.
 import unittest
 from unittest.mock import patch, MagicMock
 import os
+import time
+import threading
+import json
 import cv2
 import numpy as np
 from pathlib import Path
 import tempfile
 import shutil
+from dataset_stats import STATS_FILE
+from decision_log import DECISIONS_FILE, read_decisions
 
 from making_YOLO_dataset import (
     get_video_path,
@@ -22,6 +27,12 @@ from making_YOLO_dataset import (
     draw_grid,
     zoom_image,
     crop_image_to_screen_size,
+    read_frames,
+    main,
+    TITLE_BAR_HEIGHT,
+    AREA_SIZE,
+    RESIZE_STEP,
+    ZOOM_FACTOR,
     FrameArea
 )
 
@@ -70,6 +81,34 @@ class TestVideoAnnotation(unittest.TestCase):
             with self.assertRaises(Exception):
                 get_video_path()
 
+    def test_get_video_path_bracketed_name(self):
+        """Tests that a video whose name contains glob characters is accepted as a video.
+
+        Verifies:
+            - The path is returned as given instead of being searched as a pattern
+        """
+        video_path = os.path.join(self.test_dir, "clip [1080p].mp4")
+        open(video_path, 'a').close()
+        with patch('builtins.input', return_value=video_path):
+            self.assertEqual(get_video_path(), video_path)
+
+    def test_get_video_path_image_folder(self):
+        """Tests image folder and pattern input handling.
+
+        Verifies:
+            - Folders and glob patterns with images are returned as given
+            - Exception raised for a folder without images
+        """
+        image_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', return_value=image_dir):
+            with self.assertRaises(Exception):
+                get_video_path()
+        cv2.imwrite(os.path.join(image_dir, "frame_0.jpg"), np.zeros((8, 8, 3), dtype=np.uint8))
+        pattern = os.path.join(image_dir, "*.jpg")
+        for path in (image_dir, pattern):
+            with patch('builtins.input', return_value=path):
+                self.assertEqual(get_video_path(), path)
+
     def test_get_folder_to_save_valid(self):
         """Tests valid directory path input handling.
 
@@ -185,10 +224,33 @@ class TestVideoAnnotation(unittest.TestCase):
         self.assertTrue(h <= 800)
         self.assertTrue(w <= 1000)
 
+    def test_read_frames_indexes(self):
+        """Tests reading selected frames of a video.
+
+        Verifies:
+            - Short gaps are grabbed and long gaps are seeked over
+            - The returned frames match their indexes
+            - Reading stops at the end of the video
+        """
+        video = os.path.join(self.test_dir, "indexes.avi")
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+        for i in range(60):
+            writer.write(np.full((48, 64, 3), i * 4, dtype=np.uint8))
+        writer.release()
+
+        cap = cv2.VideoCapture(video)
+        frames = list(read_frames(cap, [0, 2, 3, 50, 59, 70], max_grab=5))
+        cap.release()
+        self.assertEqual([index for index, frame in frames], [0, 2, 3, 50, 59])
+        for index, frame in frames:
+            self.assertAlmostEqual(frame.mean(), index * 4, delta=3)
+
     @patch('cv2.VideoCapture')
     @patch('cv2.imshow')
     @patch('cv2.waitKey')
-    def test_main_workflow(self, mock_waitkey, mock_imshow, mock_cap):
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_workflow(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_cap):
         """Tests complete annotation workflow.
 
         Verifies:
@@ -223,9 +285,305 @@ class TestVideoAnnotation(unittest.TestCase):
                 ord(' '),  # Next frame
                 ord('q')  # Quit
             ]
+            main([])
 
             # Verify output files were created
             output_files = [f for f in os.listdir(self.test_dir)
                             if f.endswith('.png')]
             self.assertGreaterEqual(len(output_files), 1)
 
+    @patch('making_YOLO_dataset.zoom_image', wraps=zoom_image)
+    @patch('cv2.VideoCapture')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_zoom_factor(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_cap, mock_zoom):
+        """Tests the zoom factor of the default and of a grown area.
+
+        Verifies:
+            - The default area is zoomed by the full factor
+            - An area grown past the default is zoomed less, so that it fits the screen
+        """
+        mock_cap.return_value = MagicMock(
+            isOpened=lambda: True,
+            read=lambda: (True, np.zeros((1080, 1920, 3), dtype=np.uint8)),
+            get=lambda x: 100 if x == cv2.CAP_PROP_FRAME_COUNT else None,
+            release=lambda: None
+        )
+        save_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', side_effect=[self.test_video, save_dir, '1920x1080', '0']):
+            keys = iter([ord('z'), ord('S'), -1, -1, ord('q')])
+
+            def wait_key(delay):
+                # Leave time for the redraw of every key
+                time.sleep(0.05)
+                return next(keys)
+
+            mock_waitkey.side_effect = wait_key
+            main(['--timeline', '0'])
+
+        self.assertEqual(mock_zoom.call_args_list[0].kwargs['factor'], ZOOM_FACTOR)
+        last = mock_zoom.call_args_list[-1].kwargs
+        self.assertEqual(last['height'], AREA_SIZE + RESIZE_STEP)
+        self.assertLess(last['factor'], ZOOM_FACTOR)
+        self.assertLessEqual(last['height'] * last['factor'], 1080)
+
+    @patch('cv2.VideoCapture')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_suggest_per_area(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_cap):
+        """Tests that the suggest key starts from the best position for every area.
+
+        Verifies:
+            - After switching to another area of the same size, F moves it to the best position
+              instead of continuing the cycle of the previous area
+        """
+        frame = np.full((1080, 1920, 3), 128, dtype=np.uint8)
+        checker = (np.indices((420, 420)).sum(axis=0) // 8 % 2 * 255).astype(np.uint8)
+        frame[640:1060, 1280:1700] = checker[..., None]
+        mock_cap.return_value = MagicMock(
+            isOpened=lambda: True,
+            read=lambda: (True, frame.copy()),
+            get=lambda x: 100 if x == cv2.CAP_PROP_FRAME_COUNT else None,
+            release=lambda: None
+        )
+        save_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', side_effect=[self.test_video, save_dir, '1920x1080', '0']):
+            mock_waitkey.side_effect = [ord('f'), ord('n'), ord('f'), ord('k'), ord('q')]
+            main(['--timeline', '0'])
+
+        decisions = read_decisions(os.path.join(save_dir, DECISIONS_FILE))
+        self.assertEqual(len(decisions), 2)
+        self.assertEqual((decisions[0].x, decisions[0].y), (decisions[1].x, decisions[1].y))
+
+    @patch('cv2.VideoCapture')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_suggest_small_frame(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_cap):
+        """Tests the suggest key on frames smaller than the default area.
+
+        Verifies:
+            - The session goes on instead of ending with an error
+            - The area is shrunk to the frame, so the saved crop fits into it
+        """
+        frame = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        mock_cap.return_value = MagicMock(
+            isOpened=lambda: True,
+            read=lambda: (True, frame.copy()),
+            get=lambda x: 100 if x == cv2.CAP_PROP_FRAME_COUNT else None,
+            release=lambda: None
+        )
+        save_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', side_effect=[self.test_video, save_dir, '1920x1080', '0']):
+            mock_waitkey.side_effect = [ord('f'), ord('f'), ord('k'), ord('q')]
+            main(['--timeline', '0'])
+
+        output_files = [f for f in os.listdir(save_dir) if f.endswith('.png')]
+        self.assertEqual(len(output_files), 1)
+        image = cv2.imread(os.path.join(save_dir, output_files[0]))
+        self.assertLessEqual(image.shape[0], 240)
+        self.assertLessEqual(image.shape[1], 320)
+
+    @patch('cv2.moveWindow')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_timeline_under_frame(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_move):
+        """Tests the placement of the timeline strip.
+
+        Verifies:
+            - The strip window is moved right under the frame window once the thumbnails are built
+        """
+        video_dir = tempfile.mkdtemp(dir=self.test_dir)
+        video_path = os.path.join(video_dir, "timeline.avi")
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (640, 360))
+        for i in range(20):
+            writer.write(np.full((360, 640, 3), i * 10, dtype=np.uint8))
+        writer.release()
+
+        def wait_key(delay):
+            # Wait for the background build of the thumbnails, then quit
+            return ord('q') if mock_move.called else -1
+
+        mock_waitkey.side_effect = wait_key
+        with patch('builtins.input', side_effect=[video_path, video_dir, '1920x1080', '0']):
+            main(['--timeline', '3'])
+        mock_move.assert_any_call('frame', 0, 0)
+        mock_move.assert_any_call('timeline', 0, 360 + TITLE_BAR_HEIGHT)
+
+    @patch('cv2.VideoCapture')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_quit_while_waiting(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_cap):
+        """Tests that keys are handled while no frame is ready.
+
+        Verifies:
+            - Quitting works while the next frame is still being read
+        """
+        released = threading.Event()
+        reads = []
+
+        def read():
+            # Only the first frame is ready, the next read stalls like a long run of rejected frames
+            if reads:
+                released.wait(timeout=5)
+                return False, None
+            reads.append(1)
+            return True, np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+        mock_cap.return_value = MagicMock(
+            isOpened=lambda: True,
+            read=read,
+            get=lambda x: 100 if x == cv2.CAP_PROP_FRAME_COUNT else None,
+            release=lambda: None
+        )
+        save_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', side_effect=[self.test_video, save_dir, '1920x1080', '0']):
+            keys = iter([ord(' '), ord('q')])
+
+            def wait_key(delay):
+                key = next(keys)
+                if key == ord('q'):
+                    # Closing the session waits for the read in progress, which ends now
+                    released.set()
+                return key
+
+            mock_waitkey.side_effect = wait_key
+            started = time.monotonic()
+            try:
+                main(['--timeline', '0'])
+            finally:
+                released.set()
+            self.assertLess(time.monotonic() - started, 3)
+
+    @patch('cv2.VideoCapture')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_saves_stats_on_error(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_cap):
+        """Tests that the session statistics are saved when the session fails.
+
+        Verifies:
+            - The error is propagated
+            - dataset_stats.json counts the crop saved before the error
+        """
+        mock_cap.return_value = MagicMock(
+            isOpened=lambda: True,
+            read=lambda: (True, np.zeros((1080, 1920, 3), dtype=np.uint8)),
+            get=lambda x: 100 if x == cv2.CAP_PROP_FRAME_COUNT else None,
+            release=lambda: None
+        )
+        save_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', side_effect=[self.test_video, save_dir, '1920x1080', '0']):
+            mock_waitkey.side_effect = [ord('k'), RuntimeError("window closed")]
+            with self.assertRaises(RuntimeError):
+                main(['--timeline', '0'])
+
+        with open(os.path.join(save_dir, STATS_FILE)) as file:
+            self.assertEqual(json.load(file)["images"], 1)
+
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_mixed_size_folder(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow):
+        """Tests a folder of stills of different sizes.
+
+        Verifies:
+            - Areas moved on a large image are fitted into a smaller next image
+            - Zoom and save work on the smaller image and the logged crop lies inside it
+        """
+        image_dir = tempfile.mkdtemp(dir=self.test_dir)
+        random = np.random.default_rng(0)
+        cv2.imwrite(os.path.join(image_dir, "still_0.png"), random.integers(0, 256, (1080, 1920, 3), dtype=np.uint8))
+        cv2.imwrite(os.path.join(image_dir, "still_1.png"), random.integers(0, 256, (600, 800, 3), dtype=np.uint8))
+        save_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', side_effect=[image_dir, save_dir, '1920x1080', '0']):
+            mock_waitkey.side_effect = [ord('d')] * 4 + [ord(' '), ord('z'), ord('k'), ord('q')]
+            main(['--timeline', '0'])
+
+        decisions = read_decisions(os.path.join(save_dir, DECISIONS_FILE))
+        self.assertEqual(len(decisions), 1)
+        decision = decisions[0]
+        self.assertEqual(decision.frame, 1)
+        self.assertLessEqual(decision.x + decision.width, 800)
+        self.assertLessEqual(decision.y + decision.height, 600)
+        image = cv2.imread(os.path.join(save_dir, decision.filename))
+        self.assertEqual(image.shape, (decision.height, decision.width, 3))
+
+    @patch('cv2.VideoCapture')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    @patch('cv2.setMouseCallback')
+    def test_main_tiles_small_frame(self, mock_mouse, mock_destroy, mock_waitkey, mock_imshow, mock_cap):
+        """Tests the tile key on frames smaller than the default area.
+
+        Verifies:
+            - The session goes on instead of ending with an error
+            - The area is shrunk to the frame, so the single tile is the whole frame
+        """
+        frame = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        mock_cap.return_value = MagicMock(
+            isOpened=lambda: True,
+            read=lambda: (True, frame.copy()),
+            get=lambda x: 100 if x == cv2.CAP_PROP_FRAME_COUNT else None,
+            release=lambda: None
+        )
+        save_dir = tempfile.mkdtemp(dir=self.test_dir)
+        with patch('builtins.input', side_effect=[self.test_video, save_dir, '1920x1080', '0']):
+            mock_waitkey.side_effect = [ord('t'), ord('q')]
+            main(['--timeline', '0'])
+
+        output_files = [f for f in os.listdir(save_dir) if f.endswith('.png')]
+        self.assertEqual(len(output_files), 1)
+        image = cv2.imread(os.path.join(save_dir, output_files[0]))
+        self.assertEqual(image.shape, (240, 320, 3))
+
+    @patch('cv2.VideoCapture')
+    @patch('cv2.imshow')
+    @patch('cv2.waitKey')
+    @patch('cv2.destroyAllWindows')
+    def test_main_fast_forward(self, mock_destroy, mock_waitkey, mock_imshow, mock_cap):
+        """Tests throttled previews while skipping frames.
+
+        Verifies:
+            - Every skipped frame is consumed
+            - Only a fraction of the skipped frames is drawn
+            - The session continues to the first frame after skipping
+        """
+        frames_read = []
+
+        def read():
+            frames_read.append(1)
+            return True, np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+        mock_cap.return_value = MagicMock(
+            isOpened=lambda: True,
+            read=read,
+            get=lambda x: 1000 if x == cv2.CAP_PROP_FRAME_COUNT else None,
+            release=lambda: None
+        )
+        # Preview polls use a 1 ms delay, the annotation loop quits on its first poll
+        mock_waitkey.side_effect = lambda delay: -1 if delay == 1 else ord('q')
+
+        with patch('builtins.input', side_effect=[
+            self.test_video,  # Video path
+            self.test_dir,  # Save directory
+            '1920x1080',  # Screen resolution
+            '500'  # Frames to skip
+        ]):
+            main(['--timeline', '0', '--preview-fps', '5'])
+
+        self.assertGreater(len(frames_read), 500)
+        self.assertLess(mock_imshow.call_count, 100)
+
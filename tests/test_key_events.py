@@ -0,0 +1,58 @@
+import unittest
+from ddt import ddt, data, unpack
+from key_events import Move, Resize, coalesce_keys, drain_keys
+
+
+def keys(text: str) -> list:
+    return [ord(char) for char in text]
+
+
+@ddt
+class TestKeyEvents(unittest.TestCase):
+    """
+    Unit tests for draining and coalescing key events.
+    """
+
+    @data(
+        ("dddd", [Move(4, 0)]),  # Held key
+        ("dads", [Move(1, 1)]),  # Opposite moves cancel out
+        ("ddkw", [Move(2, 0), ord('k'), Move(0, -1)]),  # Save keeps its position in the sequence
+        ("DDDS", [Resize(3, 1)]),  # Held resize key
+        ("ddDDa", [Move(2, 0), Resize(2, 0), Move(-1, 0)]),  # Moves and resizes are merged separately
+        ("k", [ord('k')]),
+        ("", []))
+    @unpack
+    def test_coalesce_keys(self, text: str, expected: list):
+        """
+        Test that movement runs are merged while other keys keep their order.
+
+        Args:
+            text (str): Received keys.
+            expected (list): Expected events.
+        """
+        self.assertEqual(coalesce_keys(keys(text)), expected)
+
+    @data(
+        ("d", "ddd", "dddd"),  # Everything pending is a move
+        ("d", "dk ", "ddk"),  # Stops after the first non-movement key
+        ("D", "Dds", "DDds"),  # Resize keys are drained too
+        ("k", "ddd", "k"))  # Non-movement keys are not drained
+    @unpack
+    def test_drain_keys(self, first: str, pending: str, expected: str):
+        """
+        Test which pending keys are drained after the first one.
+
+        Args:
+            first (str): The key that was just received.
+            pending (str): Keys waiting in the queue.
+            expected (str): Expected collected keys.
+        """
+        queue = keys(pending)
+        wait = lambda delay: queue.pop(0) if queue else -1
+        self.assertEqual(drain_keys(ord(first), wait=wait), keys(expected))
+
+    def test_drain_keys_limit(self):
+        """
+        Test that draining stops after the limit.
+        """
+        self.assertEqual(len(drain_keys(ord('d'), wait=lambda delay: ord('d'), limit=10)), 10)
@@ -0,0 +1,74 @@
+import unittest
+import tracemalloc
+import numpy as np
+from unittest.mock import patch
+from memory_guard import MEGABYTE, MemoryGuard, get_peak_rss, get_rss
+
+
+class TestMemoryGuard(unittest.TestCase):
+    """
+    Unit tests for the memory budget guard.
+    """
+
+    def test_rss(self):
+        """
+        Test that the process memory is reported in bytes.
+        """
+        rss = get_rss()
+        self.assertGreater(rss, MEGABYTE)
+        self.assertGreaterEqual(get_peak_rss(), rss // 2)
+
+    def test_levels_go_up_only(self):
+        """
+        Test that each step of the budget raises the level, which stays when usage drops.
+        """
+        with MemoryGuard(100 * MEGABYTE) as guard:
+            for rss, level in ((50, 0), (75, 1), (85, 2), (60, 2), (95, 3), (200, 3)):
+                with patch("memory_guard.get_rss", return_value=rss * MEGABYTE):
+                    self.assertEqual(guard.check(), level)
+            self.assertGreaterEqual(guard.peak_rss, 200 * MEGABYTE)
+
+    def test_stage_peaks_and_report(self):
+        """
+        Test that the memory allocated inside a stage is recorded and the allocator is reported.
+        """
+        with MemoryGuard(1024 * MEGABYTE, top=50) as guard:
+            with guard.stage("zoom"):
+                image = np.ones((1024, 1024, 8), dtype=np.uint8)
+            with guard.stage("draw"):
+                pass
+            self.assertGreaterEqual(guard.stage_peaks["zoom"], 8 * MEGABYTE)
+            self.assertLess(guard.stage_peaks["draw"], MEGABYTE)
+            guard.check()
+            report = guard.report()
+        self.assertIn("stage zoom: 8.0 MB", report)
+        self.assertIn("test_memory_guard.py", report)
+        self.assertLess(report.index("stage zoom"), report.index("stage draw"))
+        self.assertFalse(tracemalloc.is_tracing())
+        del image
+
+    def test_keeps_outside_tracing(self):
+        """
+        Test that tracing started by someone else is not stopped by the guard.
+        """
+        tracemalloc.start()
+        try:
+            with MemoryGuard(MEGABYTE):
+                pass
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_wrong_budget(self):
+        """
+        Test that the budget must be positive.
+
+        Raises:
+            ValueError: If budget is not positive.
+        """
+        with self.assertRaises(ValueError):
+            MemoryGuard(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from pacing import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    """
+    Unit tests for the RateLimiter class.
+    """
+
+    def test_ready(self):
+        """
+        Test that actions are allowed once per interval.
+        """
+        now = [0.0]
+        limiter = RateLimiter(10, clock=lambda: now[0])
+        self.assertTrue(limiter.ready())
+        now[0] = 0.05
+        self.assertFalse(limiter.ready())
+        now[0] = 0.1
+        self.assertTrue(limiter.ready())
+        now[0] = 0.15
+        self.assertFalse(limiter.ready())
+
+    def test_wrong_rate(self):
+        """
+        Test that a non-positive rate is rejected.
+
+        Raises:
+            ValueError: If rate is not positive.
+        """
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
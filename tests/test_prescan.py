@@ -0,0 +1,94 @@
+import os
+import cv2
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from prescan import (SIGNATURE_DTYPE, difference_hash, get_signature_path, load_signatures, main, prescan_video,
+                     scan_range, select_frames)
+
+
+class TestPrescan(unittest.TestCase):
+    """
+    Unit tests for the parallel pre-scan and the signature sidecar.
+
+    Attributes:
+        test_dir (str): Path to temporary directory for test artifacts
+        test_video (str): Path to a video whose content changes every 10 frames
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Write a short test video with three scenes."""
+        cls.test_dir = tempfile.mkdtemp()
+        cls.test_video = os.path.join(cls.test_dir, "test_video.avi")
+        writer = cv2.VideoWriter(cls.test_video, cv2.VideoWriter_fourcc(*"MJPG"), 10, (160, 120))
+        random = np.random.default_rng(0)
+        scenes = [random.integers(0, 256, (120, 160, 3), dtype=np.uint8) for _ in range(3)]
+        for i in range(30):
+            writer.write(scenes[i // 10])
+        writer.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up temporary test environment."""
+        shutil.rmtree(cls.test_dir)
+
+    def test_difference_hash(self):
+        """
+        Test that the hash ignores brightness changes but not content changes.
+        """
+        random = np.random.default_rng(1)
+        image = random.integers(0, 200, (120, 160), dtype=np.uint8)
+        other = random.integers(0, 200, (120, 160), dtype=np.uint8)
+        self.assertEqual(difference_hash(image), difference_hash(image + 50))
+        self.assertGreater((difference_hash(image) ^ difference_hash(other)).bit_count(), 10)
+
+    def test_prescan_matches_sequential_scan(self):
+        """
+        Test that splitting the video between processes gives the same signatures as one pass.
+        """
+        start, sequential = scan_range(self.test_video, 0, 30)
+        parallel = prescan_video(self.test_video, workers=3)
+        self.assertEqual(parallel.dtype, SIGNATURE_DTYPE)
+        np.testing.assert_array_equal(parallel["hash"], sequential["hash"])
+        np.testing.assert_allclose(parallel["motion"], sequential["motion"], atol=1e-3)
+
+        # Motion peaks where the scene changes
+        self.assertEqual(sorted(np.argsort(parallel["motion"])[-2:].tolist()), [10, 20])
+
+    def test_select_frames(self):
+        """
+        Test that near-duplicate frames are left out.
+        """
+        signatures = prescan_video(self.test_video, workers=2)
+        self.assertEqual(list(select_frames(signatures)), list(range(30)))
+        self.assertEqual(list(select_frames(signatures, min_change=10)), [0, 10, 20])
+        self.assertEqual(list(select_frames(signatures, start=15, min_change=10)), [15, 20])
+        self.assertEqual(list(select_frames(signatures, min_sharpness=1e9)), [])
+
+    def test_main_saves_sidecar(self):
+        """
+        Test that the command writes a sidecar the annotation tool can load.
+        """
+        main([self.test_video, "--workers", "2"])
+        try:
+            signatures = load_signatures(self.test_video)
+            self.assertIsNotNone(signatures)
+            self.assertEqual(len(signatures), 30)
+        finally:
+            os.remove(get_signature_path(self.test_video))
+
+    def test_main_bracketed_name(self):
+        """
+        Test that a video whose name contains glob characters is scanned as a video.
+        """
+        video_path = os.path.join(self.test_dir, "clip [1080p].avi")
+        shutil.copy(self.test_video, video_path)
+        try:
+            main([video_path, "--workers", "2"])
+            self.assertEqual(len(load_signatures(video_path)), 30)
+        finally:
+            os.remove(get_signature_path(video_path))
+            os.remove(video_path)
+        self.assertIsNone(load_signatures(self.test_video))
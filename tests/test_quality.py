@@ -0,0 +1,105 @@
+import os
+import csv
+import cv2
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from ddt import ddt, data, unpack
+from quality import QualityGate, QualityScore, score_frame
+
+
+def make_checkerboard(size: int = 640, cell: int = 16) -> np.ndarray:
+    rows, cols = np.indices((size, size)) // cell
+    board = ((rows + cols) % 2 * 200 + 28).astype(np.uint8)
+    return cv2.cvtColor(board, cv2.COLOR_GRAY2BGR)
+
+
+@ddt
+class TestQuality(unittest.TestCase):
+    """
+    Unit tests for frame quality scoring and the QualityGate class.
+    """
+
+    def test_score_frame_blur(self):
+        """
+        Test that blurring a frame lowers its sharpness.
+        """
+        sharp = make_checkerboard()
+        blurred = cv2.GaussianBlur(sharp, (31, 31), 10)
+        self.assertGreater(score_frame(sharp).sharpness, score_frame(blurred).sharpness * 10)
+
+    @data(
+        (0, 1.0, 0.0),  # Black frame
+        (255, 0.0, 1.0),  # White frame
+        (128, 0.0, 0.0))  # Mid gray frame
+    @unpack
+    def test_score_frame_clipping(self, value: int, dark: float, bright: float):
+        """
+        Test the clipped fractions of uniform frames.
+
+        Args:
+            value (int): Gray level of the frame.
+            dark (float): Expected fraction of pixels clipped to black.
+            bright (float): Expected fraction of pixels clipped to white.
+        """
+        score = score_frame(np.full((1080, 1920, 3), value, dtype=np.uint8))
+        self.assertAlmostEqual(score.dark_clipping, dark)
+        self.assertAlmostEqual(score.bright_clipping, bright)
+
+    @data(
+        (QualityScore(50.0, 0.0, 0.0), True),
+        (QualityScore(5.0, 0.0, 0.0), False),  # Blurry
+        (QualityScore(50.0, 0.5, 0.0), False),  # Under-exposed
+        (QualityScore(50.0, 0.0, 0.5), False))  # Over-exposed
+    @unpack
+    def test_is_usable(self, score: QualityScore, expected: bool):
+        """
+        Test the thresholds of the gate.
+
+        Args:
+            score (QualityScore): The score to check.
+            expected (bool): Whether the score should pass.
+        """
+        gate = QualityGate(min_sharpness=10.0, max_clipping=0.2)
+        self.assertEqual(gate.is_usable(score), expected)
+
+    @data(
+        {"min_sharpness": -1.0},
+        {"max_clipping": 1.5},
+        {"max_clipping": -0.1},
+        {"workers": 0})
+    def test_wrong_thresholds(self, kwargs: dict):
+        """
+        Test that out of range settings are rejected.
+
+        Args:
+            kwargs (dict): Arguments passed to the gate.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        with self.assertRaises(ValueError):
+            QualityGate(**kwargs)
+
+    def test_filter(self):
+        """
+        Test that the gate keeps the order of usable frames and logs every score.
+        """
+        folder = tempfile.mkdtemp()
+        try:
+            sharp = make_checkerboard()
+            black = np.zeros_like(sharp)
+            frames = [sharp, black, sharp, black, black, sharp]
+            log_path = os.path.join(folder, "scores.csv")
+            gate = QualityGate(min_sharpness=1.0, max_clipping=0.5, workers=2, log_path=log_path)
+
+            passed = [index for index, frame, score in gate.filter(enumerate(frames), source="video")]
+            self.assertEqual(passed, [0, 2, 5])
+
+            with open(log_path, newline="") as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(tuple(rows[0]), QualityGate.LOG_HEADER)
+            self.assertEqual([row[-1] for row in rows[1:]], ["1", "0", "1", "0", "0", "1"])
+        finally:
+            shutil.rmtree(folder)
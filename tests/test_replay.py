@@ -0,0 +1,85 @@
+import os
+import cv2
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from dataset_stats import STATS_FILE
+from decision_log import DECISIONS_FILE, Decision, DecisionLog
+from replay import main, replay, split_decisions
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Unit tests for the headless re-export of logged crops.
+
+    Attributes:
+        test_dir (str): Path to temporary directory for test artifacts
+        test_video (str): Path to a video whose frames are filled with their index
+        output_dir (str): Folder the crops are exported to
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Write a short test video with a distinct brightness on every frame."""
+        cls.test_dir = tempfile.mkdtemp()
+        cls.test_video = os.path.join(cls.test_dir, "test_video.avi")
+        writer = cv2.VideoWriter(cls.test_video, cv2.VideoWriter_fourcc(*"MJPG"), 10, (160, 120))
+        for i in range(20):
+            writer.write(np.full((120, 160, 3), i * 10, dtype=np.uint8))
+        writer.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up temporary test environment."""
+        shutil.rmtree(cls.test_dir)
+
+    def setUp(self):
+        """Create an empty output folder."""
+        self.output_dir = tempfile.mkdtemp(dir=self.test_dir)
+
+    def test_split_decisions(self):
+        """
+        Test that chunks cover contiguous frames of one video and keep every decision.
+        """
+        decisions = [Decision("a", frame, f"a_{frame}.png", 0, 0, 8, 8) for frame in (9, 1, 5, 5, 3)]
+        decisions.append(Decision("b", 2, "b_2.png", 0, 0, 8, 8))
+        chunks = split_decisions(decisions, 2)
+        self.assertEqual(sorted(sum(chunks, []), key=str), sorted(decisions, key=str))
+        for chunk in chunks:
+            self.assertEqual(len({decision.source for decision in chunk}), 1)
+            frames = [decision.frame for decision in chunk]
+            self.assertEqual(frames, sorted(frames))
+        self.assertEqual([[d.frame for d in chunk] for chunk in chunks], [[1, 3], [5, 5, 9], [2]])
+
+    def test_replay(self):
+        """
+        Test that every crop is exported from the logged frame and position.
+        """
+        decisions = [Decision(self.test_video, frame, f"video_{frame}.png", 16, 8, 64, 48)
+                     for frame in (2, 5, 11, 17)]
+        decisions.append(Decision(self.test_video, 5, "video_5_area2.png", 0, 0, 32, 32))
+        count = replay(decisions, self.output_dir, workers=2)
+        self.assertEqual(count, 5)
+        for decision in decisions:
+            image = cv2.imread(os.path.join(self.output_dir, decision.filename))
+            self.assertEqual(image.shape, (decision.height, decision.width, 3))
+            self.assertAlmostEqual(float(image.mean()), decision.frame * 10, delta=4)
+        with open(os.path.join(self.output_dir, STATS_FILE)) as file:
+            self.assertEqual(json.load(file)["images"], 5)
+
+    def test_main_sizes_and_format(self):
+        """
+        Test that the command line re-exports the crops at new sizes and in a new format.
+        """
+        log_path = os.path.join(self.output_dir, DECISIONS_FILE)
+        with DecisionLog(log_path) as log:
+            log.record(Decision(self.test_video, 4, "video_4.png", 0, 0, 64, 32))
+        main([log_path, self.output_dir, "--sizes", "32", "16", "--format", "jpg", "--workers", "1"])
+        self.assertEqual(cv2.imread(os.path.join(self.output_dir, "32", "video_4.jpg")).shape, (16, 32, 3))
+        self.assertEqual(cv2.imread(os.path.join(self.output_dir, "16", "video_4.jpg")).shape, (8, 16, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+from ddt import ddt, data, unpack
+from scaling import build_pyramid, get_scaled_size, letterbox
+
+
+@ddt
+class TestScaling(unittest.TestCase):
+    """
+    Unit tests for the multi-scale pyramid.
+    """
+
+    @data(
+        ((640, 640, 3), [640, 416, 320], {640: (640, 640), 416: (416, 416), 320: (320, 320)}),
+        ((640, 640, 3), [160], {160: (160, 160)}),  # Two halvings
+        ((480, 640, 3), [320, 200], {320: (240, 320), 200: (150, 200)}),  # Keeps the aspect ratio
+        ((320, 320), [640], {640: (640, 640)}))  # Upscaling a grayscale image
+    @unpack
+    def test_build_pyramid_shapes(self, shape: tuple, sizes: list, expected: dict):
+        """
+        Test the shape of every level.
+
+        Args:
+            shape (tuple): Shape of the source image.
+            sizes (list): Requested sizes.
+            expected (dict): Expected (height, width) by size.
+        """
+        image = np.random.randint(0, 255, shape, dtype=np.uint8)
+        pyramid = build_pyramid(image, sizes)
+        self.assertEqual({size: level.shape[:2] for size, level in pyramid.items()}, expected)
+        for level in pyramid.values():
+            self.assertEqual(level.shape[2:], shape[2:])
+
+    def test_build_pyramid_reuses_source(self):
+        """
+        Test that the native size is the source itself and that smaller sizes keep the content.
+        """
+        image = np.zeros((640, 640, 3), dtype=np.uint8)
+        image[:320] = 200
+        pyramid = build_pyramid(image, [640, 320, 416])
+        self.assertIs(pyramid[640], image)
+        self.assertAlmostEqual(pyramid[320][:150].mean(), 200, delta=1)
+        self.assertAlmostEqual(pyramid[416][220:].mean(), 0, delta=1)
+
+    def test_build_pyramid_wrong_size(self):
+        """
+        Test that non-positive sizes are rejected.
+
+        Raises:
+            ValueError: If a size is not positive.
+        """
+        with self.assertRaises(ValueError):
+            build_pyramid(np.zeros((64, 64, 3), dtype=np.uint8), [32, 0])
+
+    @data(
+        ((640, 640), 320, (320, 320)),
+        ((360, 640), 320, (320, 180)),
+        ((640, 360), 320, (180, 320)))
+    @unpack
+    def test_get_scaled_size(self, shape: tuple, size: int, expected: tuple):
+        """
+        Test that the longest side is scaled to the size.
+
+        Args:
+            shape (tuple): Shape of the image.
+            size (int): Target length of the longest side.
+            expected (tuple): Expected width and height.
+        """
+        self.assertEqual(get_scaled_size(np.zeros(shape), size), expected)
+
+    @data(
+        ((300, 500, 3), 640, 1.28, (0, 128)),  # Wide crop padded top and bottom
+        ((1200, 600, 3), 640, 640 / 1200, (160, 0)),  # Tall crop padded left and right
+        ((640, 640, 3), 640, 1.0, (0, 0)),  # Already square
+        ((641, 640, 3), 640, 640 / 641, (0, 0)),  # The odd padding pixel goes right
+        ((100, 50), 320, 3.2, (80, 0)))  # Grayscale
+    @unpack
+    def test_letterbox(self, shape: tuple, size: int, ratio: float, padding: tuple):
+        """
+        Test the letterbox size, ratio, padding and padding color.
+
+        Args:
+            shape (tuple): Shape of the image.
+            size (int): Side of the square.
+            ratio (float): Expected scale ratio.
+            padding (tuple): Expected left and top padding.
+        """
+        image = np.full(shape, 255, dtype=np.uint8)
+        boxed, boxed_ratio, boxed_padding = letterbox(image, size)
+        self.assertEqual(boxed.shape, (size, size) + shape[2:])
+        self.assertAlmostEqual(boxed_ratio, ratio)
+        self.assertEqual(boxed_padding, padding)
+        if padding != (0, 0):
+            self.assertEqual(int(boxed[0, 0].min()), 114)
+        self.assertEqual(int(boxed[size // 2, size // 2].min()), 255)
+
@@ -0,0 +1,111 @@
+import cv2
+import unittest
+import numpy as np
+from ddt import ddt, data, unpack
+from frame_area import FrameArea
+from suggestion import get_edge_map, score_positions, suggest_positions
+
+
+def make_area(width: int, height: int, divider: int) -> FrameArea:
+    area = FrameArea(divider=divider)
+    area.width = width
+    area.height = height
+    return area
+
+
+def make_frame(blocks) -> np.ndarray:
+    """Draw checkerboard patches, full of edges, on a flat gray frame."""
+    frame = np.full((240, 320, 3), 128, dtype=np.uint8)
+    checker = (np.indices((40, 40)).sum(axis=0) // 4 % 2 * 255).astype(np.uint8)
+    for x, y in blocks:
+        frame[y:y + 40, x:x + 40] = checker[..., None]
+    return frame
+
+
+@ddt
+class TestSuggestion(unittest.TestCase):
+    """
+    Unit tests for the integral-image scoring of crop positions.
+    """
+
+    def test_flat_frame_has_no_edges(self):
+        """
+        Test that a flat frame gives a zero edge map and zero scores.
+        """
+        frame = np.full((120, 160), 90, dtype=np.uint8)
+        self.assertEqual(int(get_edge_map(frame).sum()), 0)
+        _, _, scores = score_positions(frame, make_area(40, 40, 2))
+        self.assertFalse(scores.any())
+
+    @data((80, 80, 2), (64, 48, 4), (100, 60, 3))
+    @unpack
+    def test_scores_match_window_sums(self, width, height, divider):
+        """
+        Test that the integral-image scores equal the edge pixels counted in each window.
+        """
+        frame = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        area = make_area(width, height, divider)
+        xs, ys, scores = score_positions(frame, area)
+        edges = get_edge_map(frame)
+        self.assertEqual(scores.shape, (len(ys), len(xs)))
+        self.assertLessEqual(xs[-1] + width, 320)
+        for row, y in enumerate(ys):
+            for col, x in enumerate(xs):
+                self.assertEqual(scores[row, col], int(edges[y:y + height, x:x + width].sum()))
+
+    def test_suggest_best_position(self):
+        """
+        Test that the area goes to the grid position covering the busy patch.
+        """
+        frame = make_frame([(200, 120)])
+        self.assertEqual(suggest_positions(frame, make_area(40, 40, 1)), [(200, 120)])
+
+    def test_suggest_on_reduced_frame(self):
+        """
+        Test that frames scored at a reduced size still give positions in frame coordinates.
+        """
+        frame = make_frame([(200, 120)])
+        xs, ys, _ = score_positions(frame, make_area(40, 40, 1), size=160)
+        self.assertEqual((xs[-1], ys[-1]), (280, 200))
+        # 2560x1920 is above the default size of 1920, so it is scored at three quarters
+        large = cv2.resize(frame, (2560, 1920), interpolation=cv2.INTER_NEAREST)
+        self.assertEqual(suggest_positions(large, make_area(320, 320, 1)), [(1600, 960)])
+
+    def test_suggest_non_overlapping(self):
+        """
+        Test that further suggestions never overlap earlier ones.
+        """
+        frame = make_frame([(200, 120), (40, 40), (240, 160)])
+        area = make_area(80, 80, 2)
+        positions = suggest_positions(frame, area, count=4)
+        self.assertEqual(len(positions), 4)
+        for i, (x, y) in enumerate(positions):
+            for other_x, other_y in positions[:i]:
+                self.assertTrue(abs(x - other_x) >= 80 or abs(y - other_y) >= 80)
+        # The best window holds two patches, the second best holds the third one
+        self.assertEqual(positions[0], (200, 120))
+        self.assertIn(positions[1], [(0, 0), (40, 0), (0, 40), (40, 40)])
+
+    def test_wrong_count(self):
+        """
+        Test that the number of suggestions must be positive.
+
+        Raises:
+            ValueError: If count is not positive.
+        """
+        with self.assertRaises(ValueError):
+            suggest_positions(make_frame([]), make_area(40, 40, 1), count=0)
+
+    def test_area_too_large(self):
+        """
+        Test that an area larger than the frame is rejected.
+
+        Raises:
+            ValueError: If the area does not fit into the frame.
+        """
+        with self.assertRaises(ValueError):
+            score_positions(make_frame([]), make_area(400, 40, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from ddt import ddt, data, unpack
+from frame_area import FrameArea
+from image_writer import ImageWriter
+from tiling import get_tile_windows, iter_tiles, export_tiles
+
+
+def make_area(width: int, height: int, divider: int) -> FrameArea:
+    area = FrameArea(divider=divider)
+    area.width = width
+    area.height = height
+    return area
+
+
+@ddt
+class TestTiling(unittest.TestCase):
+    """
+    Unit tests for the sliding-window tiling export.
+    """
+
+    @data(
+        ((1080, 1920, 3), 640, 640, 3, (3, 7)),  # Full HD, 213px stride
+        ((2160, 3840, 3), 640, 640, 3, (8, 16)),  # 4K
+        ((640, 640, 3), 640, 640, 3, (1, 1)),  # Exactly one window
+        ((100, 120), 40, 40, 2, (4, 5)),  # Grayscale frame
+        ((100, 120, 3), 60, 20, 1, (5, 2)))  # Non-square area
+    @unpack
+    def test_get_tile_windows_shape(self, shape: tuple, width: int, height: int, divider: int, grid: tuple):
+        """
+        Test that every valid window at the grid stride is produced.
+
+        Args:
+            shape (tuple): Shape of the frame.
+            width (int): Width of the area.
+            height (int): Height of the area.
+            divider (int): The number of divisions for the grid.
+            grid (tuple): Expected number of rows and columns.
+        """
+        frame = np.zeros(shape, dtype=np.uint8)
+        windows = get_tile_windows(frame, make_area(width, height, divider))
+        self.assertEqual(windows.shape[:2], grid)
+        self.assertEqual(windows.shape[2:], (height, width) + shape[2:])
+
+    def test_iter_tiles_are_views(self):
+        """
+        Test that tiles match the frame region and share memory with it.
+        """
+        frame = np.random.randint(0, 255, (100, 120, 3), dtype=np.uint8)
+        area = make_area(40, 40, 2)
+        tiles = list(iter_tiles(frame, area))
+        self.assertEqual(len(tiles), 20)
+        for x, y, tile in tiles:
+            self.assertTrue(np.shares_memory(tile, frame))
+            np.testing.assert_array_equal(tile, frame[y:y + 40, x:x + 40])
+
+    @data(
+        (0, 40, 2),  # Empty width
+        (40, 40, 0),  # No grid step
+        (200, 40, 2))  # Larger than the frame
+    @unpack
+    def test_get_tile_windows_wrong_area(self, width: int, height: int, divider: int):
+        """
+        Test that invalid areas are rejected.
+
+        Args:
+            width (int): Width of the area.
+            height (int): Height of the area.
+            divider (int): The number of divisions for the grid.
+
+        Raises:
+            ValueError: If the area can not be tiled over the frame.
+        """
+        frame = np.zeros((100, 120, 3), dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            get_tile_windows(frame, make_area(width, height, divider))
+
+    def test_export_tiles(self):
+        """
+        Test that every tile is written through the writer.
+        """
+        folder = tempfile.mkdtemp()
+        try:
+            frame = np.random.randint(0, 255, (100, 120, 3), dtype=np.uint8)
+            with ImageWriter(folder) as writer:
+                tiles = export_tiles(frame, make_area(40, 40, 2), writer, prefix="video_7")
+            self.assertEqual(len(tiles), 20)
+            self.assertIn(("video_7_x80_y60.png", 80, 60), tiles)
+            self.assertEqual(len(os.listdir(folder)), 20)
+            self.assertIn("video_7_x80_y60.png", os.listdir(folder))
+        finally:
+            shutil.rmtree(folder)
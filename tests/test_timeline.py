@@ -0,0 +1,126 @@
+import os
+import cv2
+import time
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from ddt import ddt, data, unpack
+from timeline import THUMBNAIL_HEIGHT, TimelineBuilder, TimelineStrip, build_timeline, get_sample_indexes, \
+    get_timeline_path
+
+
+@ddt
+class TestTimeline(unittest.TestCase):
+    """
+    Unit tests for the thumbnail timeline.
+
+    Attributes:
+        test_dir (str): Path to temporary directory for test artifacts
+        test_video (str): Path to a 100 frame video whose brightness equals twice the frame index
+    """
+
+    def setUp(self):
+        """Write a short test video."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_video = os.path.join(self.test_dir, "test_video.avi")
+        writer = cv2.VideoWriter(self.test_video, cv2.VideoWriter_fourcc(*"MJPG"), 10, (192, 108))
+        for i in range(100):
+            writer.write(np.full((108, 192, 3), i * 2, dtype=np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        """Clean up temporary test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_build_timeline_of_pattern(self):
+        """
+        Test that the mosaic of a glob pattern is saved next to the image folder under a valid name.
+        """
+        folder = os.path.join(self.test_dir, "stills")
+        os.mkdir(folder)
+        for i in range(6):
+            cv2.imwrite(os.path.join(folder, f"still_{i}.jpg"), np.full((108, 192, 3), i * 40, dtype=np.uint8))
+        pattern = os.path.join(folder, "*.jpg")
+        thumbnails = build_timeline(pattern, 3)
+        self.assertEqual(thumbnails.shape, (3, THUMBNAIL_HEIGHT, 96, 3))
+        self.assertEqual(get_timeline_path(pattern), os.path.join(self.test_dir, "stills._.jpg.timeline.npy"))
+        self.assertTrue(os.path.isfile(get_timeline_path(pattern)))
+        self.assertEqual(sorted(os.listdir(folder)), [f"still_{i}.jpg" for i in range(6)])
+        # The same pattern typed differently uses the same mosaic
+        self.assertEqual(get_timeline_path(os.path.relpath(pattern)), get_timeline_path(pattern))
+
+    def test_build_timeline(self):
+        """
+        Test that thumbnails of the sampled frames are built once and reused.
+        """
+        thumbnails = build_timeline(self.test_video, 5)
+        self.assertEqual(thumbnails.shape, (5, THUMBNAIL_HEIGHT, 96, 3))
+        self.assertIsInstance(thumbnails, np.memmap)
+        for thumbnail, index in zip(thumbnails, get_sample_indexes(100, 5)):
+            self.assertAlmostEqual(thumbnail.mean(), index * 2, delta=3)
+
+        modified = os.path.getmtime(get_timeline_path(self.test_video))
+        build_timeline(self.test_video, 5)
+        self.assertEqual(os.path.getmtime(get_timeline_path(self.test_video)), modified)
+        self.assertEqual(build_timeline(self.test_video, 7).shape[0], 7)
+
+    def test_builder(self):
+        """
+        Test that the background builder returns the thumbnails once done.
+        """
+        with TimelineBuilder(self.test_video, 4) as builder:
+            deadline = time.monotonic() + 5
+            while not builder.done and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(builder.done)
+            self.assertEqual(builder.result.shape[0], 4)
+
+    def test_builder_wrong_count(self):
+        """
+        Test that a non-positive number of thumbnails is rejected.
+
+        Raises:
+            ValueError: If count is not positive.
+        """
+        with self.assertRaises(ValueError):
+            TimelineBuilder(self.test_video, 0)
+
+    @data(
+        (0, 0),
+        (95, 0),
+        (96, 33),
+        (200, 66),
+        (383, 99))
+    @unpack
+    def test_strip_get_index(self, x: int, expected: int):
+        """
+        Test mapping a position on the strip to a frame.
+
+        Args:
+            x (int): X-coordinate on the strip.
+            expected (int): Expected frame index.
+        """
+        strip = TimelineStrip(np.zeros((4, 54, 96, 3), dtype=np.uint8), 100, 384)
+        self.assertEqual(strip.image.shape, (54, 384, 3))
+        self.assertEqual(strip.get_index(x), expected)
+
+    @data(
+        (0, 1, 33),
+        (33, 1, 66),
+        (40, -1, 33),  # Back to the start of the current cell
+        (33, -1, 0),
+        (0, -1, 0),
+        (99, 1, 99))
+    @unpack
+    def test_strip_get_neighbour(self, index: int, step: int, expected: int):
+        """
+        Test stepping between thumbnails.
+
+        Args:
+            index (int): The current frame index.
+            step (int): Number of thumbnails to move.
+            expected (int): Expected frame index.
+        """
+        strip = TimelineStrip(np.zeros((4, 54, 96, 3), dtype=np.uint8), 100, 384)
+        self.assertEqual(strip.get_neighbour(index, step), expected)
@@ -0,0 +1,72 @@
+import numpy as np
+from frame_area import FrameArea
+from image_writer import ImageWriter
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterator, List, Tuple
+
+
+def get_tile_windows(frame: np.ndarray, area: FrameArea) -> np.ndarray:
+    """
+    Build a zero-copy view of every window of the area size at the area grid stride.
+
+    Args:
+        frame (np.ndarray): The original image frame.
+        area (FrameArea): The FrameArea object whose width, height and steps define the windows.
+
+    Returns:
+        np.ndarray: Array of shape (rows, cols, height, width[, channels]) sharing memory with the frame.
+
+    Raises:
+        ValueError: If the area is empty, has no grid step or does not fit into the frame.
+    """
+    if area.width == 0 or area.height == 0:
+        raise ValueError("The area must have a non-zero width and height.")
+    if area.divider == 0 or area.x_step == 0 or area.y_step == 0:
+        raise ValueError("The area grid step must be greater than zero.")
+    if area.height > frame.shape[0] or area.width > frame.shape[1]:
+        raise ValueError("The area exceeds the image boundaries.")
+
+    windows = sliding_window_view(frame, (area.height, area.width), axis=(0, 1))
+    windows = windows[::area.y_step, ::area.x_step]
+    if frame.ndim == 3:
+        # sliding_window_view appends the window axes after the channel axis
+        windows = windows.transpose(0, 1, 3, 4, 2)
+    return windows
+
+
+def iter_tiles(frame: np.ndarray, area: FrameArea) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Iterate over every tile of the frame at the area grid stride.
+
+    Args:
+        frame (np.ndarray): The original image frame.
+        area (FrameArea): The FrameArea object defining the tile size and stride.
+
+    Yields:
+        Tuple[int, int, np.ndarray]: The x and y coordinates of the tile and the tile view.
+    """
+    windows = get_tile_windows(frame, area)
+    for row in range(windows.shape[0]):
+        for col in range(windows.shape[1]):
+            yield col * area.x_step, row * area.y_step, windows[row, col]
+
+
+def export_tiles(frame: np.ndarray, area: FrameArea, writer: ImageWriter, prefix: str) -> List[Tuple[str, int, int]]:
+    """
+    Queue every tile of the frame for saving.
+
+    Args:
+        frame (np.ndarray): The original image frame.
+        area (FrameArea): The FrameArea object defining the tile size and stride.
+        writer (ImageWriter): Writer that saves the tiles.
+        prefix (str): File name prefix, the tile coordinates are appended to it.
+
+    Returns:
+        List[Tuple[str, int, int]]: File name and x and y coordinates of every queued tile.
+    """
+    tiles = []
+    for x, y, tile in iter_tiles(frame, area):
+        filename = f"{prefix}_x{x}_y{y}.png"
+        writer.submit(filename, tile)
+        tiles.append((filename, x, y))
+    return tiles
@@ -0,0 +1,222 @@
+import os
+import cv2
+import threading
+import numpy as np
+from frame_source import get_sidecar_base, open_source
+from typing import Optional
+
+THUMBNAIL_HEIGHT = 54
+
+
+def get_timeline_path(video_path: os.PathLike) -> str:
+    """
+    Get the path of the thumbnail mosaic of a video.
+
+    Args:
+        video_path (os.PathLike): Path of the video.
+
+    Returns:
+        str: Path of the .npy file next to the video, or next to the folder of an image sequence.
+    """
+    return f"{get_sidecar_base(video_path)}.timeline.npy"
+
+
+def get_sample_indexes(frames_count: int, count: int) -> np.ndarray:
+    """
+    Get the indexes of the frames sampled for the timeline.
+
+    Args:
+        frames_count (int): Number of frames in the video.
+        count (int): Number of thumbnails.
+
+    Returns:
+        np.ndarray: Ascending frame indexes spread evenly over the video.
+    """
+    return np.linspace(0, max(0, frames_count - 1), count).round().astype(int)
+
+
+def build_timeline(video_path: os.PathLike, count: int,
+                   stop: Optional[threading.Event] = None) -> Optional[np.ndarray]:
+    """
+    Build the thumbnail mosaic of a video, or open it if it was built before.
+
+    Thumbnails are written straight into a memory-mapped .npy file, which is
+    renamed into place only when complete, so later sessions never see a
+    partial mosaic.
+
+    Args:
+        video_path (os.PathLike): Path of the video.
+        count (int): Number of thumbnails.
+        stop (Optional[threading.Event]): Event that cancels the build when set.
+
+    Returns:
+        Optional[np.ndarray]: Memory-mapped thumbnails of shape (count, height, width, 3),
+            or None if the build was cancelled or no frame could be read.
+    """
+    path = get_timeline_path(video_path)
+    if os.path.isfile(path):
+        thumbnails = np.load(path, mmap_mode="r")
+        if thumbnails.shape[0] == count:
+            return thumbnails
+
+    cap = open_source(video_path)
+    indexes = get_sample_indexes(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), count)
+    part_path = f"{path}.part"
+    thumbnails = None
+    try:
+        for i, index in enumerate(indexes):
+            if stop is not None and stop.is_set():
+                return None
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            ret, frame = cap.read()
+            if not ret:
+                continue
+            if thumbnails is None:
+                size = (max(1, round(THUMBNAIL_HEIGHT * frame.shape[1] / frame.shape[0])), THUMBNAIL_HEIGHT)
+                thumbnails = np.lib.format.open_memmap(part_path, mode="w+", dtype=np.uint8,
+                                                       shape=(count, size[1], size[0], 3))
+            thumbnails[i] = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    finally:
+        cap.release()
+        if thumbnails is not None:
+            thumbnails.flush()
+            del thumbnails
+            if stop is not None and stop.is_set():
+                os.remove(part_path)
+
+    if not os.path.isfile(part_path):
+        return None
+    os.replace(part_path, path)
+    return np.load(path, mmap_mode="r")
+
+
+class TimelineBuilder:
+    """
+    Class to build the thumbnail mosaic of a video in a background thread.
+
+    Attributes:
+        video_path (os.PathLike): Path of the video.
+        count (int): Number of thumbnails.
+    """
+
+    def __init__(self, video_path: os.PathLike, count: int):
+        """
+        Initializes the TimelineBuilder instance and starts the build.
+
+        Args:
+            video_path (os.PathLike): Path of the video.
+            count (int): Number of thumbnails.
+
+        Raises:
+            ValueError: If count is not positive.
+        """
+        if count <= 0:
+            raise ValueError(f"Field 'count' should be greater than zero, but got {count}")
+        self.video_path = video_path
+        self.count = count
+        self._result = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="timeline-builder", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        """Check whether the build has finished."""
+        return not self._thread.is_alive()
+
+    @property
+    def result(self) -> Optional[np.ndarray]:
+        """Get the thumbnails, None until the build has finished successfully."""
+        return self._result if self.done else None
+
+    def close(self) -> None:
+        """Cancel the build if it is still running and wait for the thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "TimelineBuilder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        self._result = build_timeline(self.video_path, self.count, stop=self._stop)
+
+
+class TimelineStrip:
+    """
+    Class to draw the thumbnail mosaic as a strip and map positions on it to frames.
+
+    Attributes:
+        frames_count (int): Number of frames in the video.
+        indexes (np.ndarray): Frame index of every thumbnail.
+        image (np.ndarray): The strip scaled to the requested width.
+    """
+
+    def __init__(self, thumbnails: np.ndarray, frames_count: int, width: int):
+        """
+        Initializes the TimelineStrip instance.
+
+        Args:
+            thumbnails (np.ndarray): Thumbnails of shape (count, height, width, 3).
+            frames_count (int): Number of frames in the video.
+            width (int): Width of the strip in pixels.
+        """
+        self.frames_count = frames_count
+        self.indexes = get_sample_indexes(frames_count, thumbnails.shape[0])
+        strip = np.concatenate(thumbnails, axis=1)
+        height = max(1, round(strip.shape[0] * width / strip.shape[1]))
+        self.image = cv2.resize(strip, (width, height), interpolation=cv2.INTER_AREA)
+
+    @property
+    def cell_width(self) -> float:
+        """Get the width of one thumbnail on the strip."""
+        return self.image.shape[1] / len(self.indexes)
+
+    def get_index(self, x: int) -> int:
+        """
+        Get the frame shown by the thumbnail under a strip position.
+
+        Args:
+            x (int): X-coordinate on the strip.
+
+        Returns:
+            int: The frame index.
+        """
+        cell = min(len(self.indexes) - 1, max(0, int(x / self.cell_width)))
+        return int(self.indexes[cell])
+
+    def get_neighbour(self, index: int, step: int) -> int:
+        """
+        Get the frame of the thumbnail a number of cells away from a frame.
+
+        Args:
+            index (int): The current frame index.
+            step (int): Number of thumbnails to move, negative values move back.
+
+        Returns:
+            int: The frame index of the target thumbnail.
+        """
+        cell = int(np.searchsorted(self.indexes, index, side="right")) - 1
+        if step < 0 and self.indexes[max(0, cell)] < index:
+            # Going back from the middle of a cell first returns to its start
+            cell += 1
+        cell = min(len(self.indexes) - 1, max(0, cell + step))
+        return int(self.indexes[cell])
+
+    def render(self, index: int, color=(0, 0, 255)) -> np.ndarray:
+        """
+        Draw the strip with a marker at the current frame.
+
+        Args:
+            index (int): The current frame index.
+            color (tuple): Color of the marker in BGR format (default is red).
+
+        Returns:
+            np.ndarray: The strip image.
+        """
+        strip = self.image.copy()
+        x = int(index / max(1, self.frames_count - 1) * (strip.shape[1] - 1))
+        cv2.line(strip, (x, 0), (x, strip.shape[0] - 1), color, 2)
+        return strip